@@ -1,25 +1,55 @@
+import importlib
+import time
+
 from flask import Flask
 from flask_cors import CORS
 
+from app.config import Config
+from app.services.lazy import warm_up
+from app.services.uploads import SpooledRequest
+
+# (module, blueprint attribute) — imported lazily so heavy resources inside
+# the route modules are only built on first use or by WARMUP_ON_START.
+BLUEPRINTS = [
+    ("app.routes.govscheme", "govscheme_bp"),
+    ("app.routes.translate", "translate_bp"),
+    ("app.routes.plant_disease", "plant_disease_bp"),
+    ("app.routes.postharvest", "postharvest_bp"),
+    ("app.routes.agri_advisory", "agri_advisory_bp"),
+    ("app.routes.fertilizer", "fertilizer_bp"),
+    ("app.routes.market", "weather_market_bp"),
+    ("app.routes.stats", "stats_bp"),
+]
+
+
 def create_app():
     app = Flask(__name__)
+    app.config.from_object(Config)
+    app.request_class = SpooledRequest
     CORS(app)
 
-    # Register blueprints
-    from app.routes.govscheme import govscheme_bp
-    from app.routes.translate import translate_bp
-    from app.routes.plant_disease import plant_disease_bp
-    from app.routes.postharvest import postharvest_bp
-    from app.routes.agri_advisory import agri_advisory_bp
-    from app.routes.fertilizer import fertilizer_bp
-    from app.routes.market import weather_market_bp
-
-    app.register_blueprint(govscheme_bp)
-    app.register_blueprint(translate_bp)
-    app.register_blueprint(plant_disease_bp)
-    app.register_blueprint(postharvest_bp)
-    app.register_blueprint(agri_advisory_bp)
-    app.register_blueprint(fertilizer_bp)
-    app.register_blueprint(weather_market_bp)
+    # Register blueprints, timing each import
+    startup_report = []
+    for module_name, bp_name in BLUEPRINTS:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        app.register_blueprint(getattr(module, bp_name))
+        startup_report.append((module_name, time.perf_counter() - start))
+    app.extensions["startup_report"] = startup_report
+
+    if app.config["STARTUP_REPORT"]:
+        print_startup_report(startup_report)
+
+    # Runs in every process that builds the app, i.e. in each serving worker
+    # (gunicorn without --preload), so no request pays for the first load
+    if app.config["WARMUP_ON_START"]:
+        print_startup_report(list(warm_up().items()), title="Warm-up")
 
     return app
+
+
+def print_startup_report(timings, title="Blueprint import"):
+    total = sum(seconds for _, seconds in timings)
+    print(f"[STARTUP] {title} times (total {total * 1000:.1f} ms):")
+    for name, seconds in timings:
+        print(f"[STARTUP]   {name:<32} {seconds * 1000:8.1f} ms")
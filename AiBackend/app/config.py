@@ -3,5 +3,138 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _env_bool(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def _env_float(name, default):
+    return float(os.getenv(name, default))
+
+
 class Config:
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+    GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+
+    # Shared HTTP client (keep-alive pool + retries)
+    HTTP_POOL_SIZE = _env_int("HTTP_POOL_SIZE", 32)
+    HTTP_CONNECT_TIMEOUT = _env_float("HTTP_CONNECT_TIMEOUT", 5)
+    HTTP_READ_TIMEOUT = _env_float("HTTP_READ_TIMEOUT", 120)
+    HTTP_MAX_RETRIES = _env_int("HTTP_MAX_RETRIES", 3)
+    HTTP_BACKOFF_FACTOR = _env_float("HTTP_BACKOFF_FACTOR", 0.5)
+
+    # Location / soil / weather lookups: per-call deadline (s) and shared pool
+    UPSTREAM_TIMEOUT = _env_float("UPSTREAM_TIMEOUT", 5)
+    FANOUT_WORKERS = _env_int("FANOUT_WORKERS", 16)
+
+    # Batch fertilizer recommendations
+    BATCH_MAX_PLOTS = _env_int("BATCH_MAX_PLOTS", 500)
+    BATCH_LLM_CONCURRENCY = _env_int("BATCH_LLM_CONCURRENCY", 8)
+
+    # /translate: documents over TRANSLATE_CHUNK_TOKENS are split and the
+    # parts explained concurrently (at most TRANSLATE_MAX_PARALLEL at once)
+    TRANSLATE_CHUNK_TOKENS = _env_int("TRANSLATE_CHUNK_TOKENS", 6000)
+    TRANSLATE_MAX_PARALLEL = _env_int("TRANSLATE_MAX_PARALLEL", 4)
+
+    # Uploads: bodies over MAX_CONTENT_LENGTH get 413 (Flask), files over
+    # UPLOAD_SPOOL_THRESHOLD bytes are spooled to UPLOAD_TMP_DIR while parsing
+    MAX_CONTENT_LENGTH = _env_int("MAX_CONTENT_LENGTH_MB", 32) * 1024 * 1024
+    UPLOAD_SPOOL_THRESHOLD = _env_int("UPLOAD_SPOOL_THRESHOLD", 512 * 1024)
+    UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR") or None
+    TRANSLATE_MAX_UPLOAD_MB = _env_float("TRANSLATE_MAX_UPLOAD_MB", 25)
+    PLANT_DISEASE_MAX_UPLOAD_MB = _env_float("PLANT_DISEASE_MAX_UPLOAD_MB", 15)
+    # /plant-disease: photos are re-encoded to at most IMAGE_MAX_SIDE px
+    IMAGE_PREPROCESS = _env_bool("IMAGE_PREPROCESS", True)
+    IMAGE_MAX_SIDE = _env_int("IMAGE_MAX_SIDE", 1024)
+    IMAGE_FORMAT = os.getenv("IMAGE_FORMAT", "jpeg")  # or "webp"
+    IMAGE_QUALITY = _env_int("IMAGE_QUALITY", 80)
+    # Reuse a diagnosis for photos within N bits (of 64) of a recent one whose
+    # hue histogram also differs by at most the given share of the image
+    DIAGNOSIS_CACHE = _env_bool("DIAGNOSIS_CACHE", True)
+    DIAGNOSIS_CACHE_MAX_DISTANCE = _env_int("DIAGNOSIS_CACHE_MAX_DISTANCE", 4)
+    DIAGNOSIS_CACHE_MAX_COLOR_DISTANCE = _env_float("DIAGNOSIS_CACHE_MAX_COLOR_DISTANCE", 0.05)
+    DIAGNOSIS_CACHE_TTL = _env_int("DIAGNOSIS_CACHE_TTL", 7 * 24 * 3600)
+    DIAGNOSIS_CACHE_MAX_ENTRIES = _env_int("DIAGNOSIS_CACHE_MAX_ENTRIES", 10000)
+    # Optional local ONNX triage (needs onnxruntime); empty path = disabled.
+    # Predictions at or above the threshold are answered without Groq.
+    DISEASE_CLASSIFIER_MODEL = os.getenv("DISEASE_CLASSIFIER_MODEL", "")
+    DISEASE_CLASSIFIER_LABELS = os.getenv("DISEASE_CLASSIFIER_LABELS", "")
+    DISEASE_CLASSIFIER_THRESHOLD = _env_float("DISEASE_CLASSIFIER_THRESHOLD", 0.85)
+    DISEASE_CLASSIFIER_INPUT_SIZE = _env_int("DISEASE_CLASSIFIER_INPUT_SIZE", 224)
+    DISEASE_CLASSIFIER_THREADS = _env_int("DISEASE_CLASSIFIER_THREADS", 1)
+
+    # Serving (serve.py)
+    SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT = _env_int("SERVER_PORT", 5000)
+    ASYNC_MAX_CONNECTIONS = _env_int("ASYNC_MAX_CONNECTIONS", 1000)
+
+    # Embeddings / vector store
+    EMBED_MODEL = os.getenv("EMBED_MODEL", "all-MiniLM-L6-v2")
+    # Shared embedding service (embedding_server.py); empty = model in-process
+    EMBED_SERVICE_SOCKET = os.getenv("EMBED_SERVICE_SOCKET", "")
+    EMBED_BATCH_WINDOW_MS = _env_float("EMBED_BATCH_WINDOW_MS", 3.0)
+    EMBED_BATCH_MAX = _env_int("EMBED_BATCH_MAX", 64)
+    EMBED_CACHE_SIZE = _env_int("EMBED_CACHE_SIZE", 10000)
+    PDF_DATA_DIR = os.getenv("PDF_DATA_DIR", os.path.join(BASE_DIR, "app", "data"))
+    VECTOR_STORE_DIR = os.getenv("VECTOR_STORE_DIR", os.path.join(BASE_DIR, "app", "chroma_db"))
+    VECTOR_COLLECTION = os.getenv("VECTOR_COLLECTION", "my_collection")
+    VECTOR_STORE_MIN_DOCS = _env_int("VECTOR_STORE_MIN_DOCS", 1)
+    # Retriever backend: "chroma" or "faiss" (index built by build_faiss_index.py)
+    RETRIEVER_BACKEND = os.getenv("RETRIEVER_BACKEND", "chroma")
+    FAISS_INDEX_DIR = os.getenv("FAISS_INDEX_DIR", os.path.join(BASE_DIR, "app", "faiss_index"))
+    VECTOR_STORE_WARMUP_QUERY = os.getenv("VECTOR_STORE_WARMUP_QUERY", "fertilizer dose for wheat")
+    # Retrieval: "hybrid" fuses BM25 and vector candidates (RRF), "vector" is
+    # plain similarity search. RERANKER_MODEL (a cross-encoder) is optional.
+    RETRIEVER_MODE = os.getenv("RETRIEVER_MODE", "hybrid")
+    RETRIEVER_CANDIDATES = _env_int("RETRIEVER_CANDIDATES", 20)
+    RETRIEVER_RRF_K = _env_int("RETRIEVER_RRF_K", 60)
+    RERANKER_MODEL = os.getenv("RERANKER_MODEL", "")
+
+    # Advisory RAG tool: "chunks" returns ranked passages to the agent,
+    # "qa" runs a (cached) RetrievalQA chain — one extra LLM call per use
+    ADVISORY_RETRIEVAL_MODE = os.getenv("ADVISORY_RETRIEVAL_MODE", "chunks")
+    ADVISORY_RETRIEVAL_K = _env_int("ADVISORY_RETRIEVAL_K", 3)
+    ADVISORY_CREW_POOL_SIZE = _env_int("ADVISORY_CREW_POOL_SIZE", 4)
+    # mode=parallel: agents run side by side under one deadline (s)
+    ADVISORY_MAX_AGENTS = _env_int("ADVISORY_MAX_AGENTS", 3)
+    ADVISORY_PARALLEL_WORKERS = _env_int("ADVISORY_PARALLEL_WORKERS", 8)
+    ADVISORY_DEADLINE = _env_float("ADVISORY_DEADLINE", 60)
+
+    # Advisory topic routing: "embedding" (MiniLM centroids) or "keyword"
+    TOPIC_ROUTER = os.getenv("TOPIC_ROUTER", "keyword")
+    TOPIC_ROUTER_THRESHOLD = _env_float("TOPIC_ROUTER_THRESHOLD", 0.35)
+    TOPIC_ROUTER_MULTI_MARGIN = _env_float("TOPIC_ROUTER_MULTI_MARGIN", 0.05)
+
+    # Response cache (comma-separated endpoints opt in: govscheme,advisory,postharvest)
+    RESPONSE_CACHE_ENDPOINTS = os.getenv("RESPONSE_CACHE_ENDPOINTS", "")
+    RESPONSE_CACHE_TTL = _env_int("RESPONSE_CACHE_TTL", 24 * 3600)
+    RESPONSE_CACHE_MAX_ENTRIES = _env_int("RESPONSE_CACHE_MAX_ENTRIES", 1000)
+    RESPONSE_CACHE_SEMANTIC = _env_bool("RESPONSE_CACHE_SEMANTIC", True)
+    RESPONSE_CACHE_SEMANTIC_THRESHOLD = _env_float("RESPONSE_CACHE_SEMANTIC_THRESHOLD", 0.92)
+
+    # Local caches
+    CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(BASE_DIR, "cache"))
+    SOIL_CACHE_CELL_DEG = _env_float("SOIL_CACHE_CELL_DEG", 0.05)  # ~5.5 km
+    SOIL_CACHE_TTL = _env_int("SOIL_CACHE_TTL", 180 * 24 * 3600)
+
+    WEATHER_CACHE_CELL_DEG = _env_float("WEATHER_CACHE_CELL_DEG", 0.1)  # ~11 km
+    WEATHER_FORECAST_HOURS = _env_int("WEATHER_FORECAST_HOURS", 6)
+
+    # /translate: extracted PDF text and finished translations by content hash
+    DOCUMENT_CACHE_MAX_MB = _env_int("DOCUMENT_CACHE_MAX_MB", 256)
+
+    # Startup
+    STARTUP_REPORT = _env_bool("STARTUP_REPORT", True)
+    # Build embeddings, vector store (and its collection check), LLM clients
+    # and chains in each worker at startup. Set to true in production: when
+    # off, the first request to each worker pays for loading them.
+    WARMUP_ON_START = _env_bool("WARMUP_ON_START", False)
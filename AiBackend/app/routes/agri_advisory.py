@@ -1,151 +1,312 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from flask import Blueprint, request, jsonify
-from crewai import Agent, Task, Crew, Process, LLM
-from crewai.tools import tool
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import Chroma
-from langchain.chains import RetrievalQA
+
+from app.config import Config
+from app.services.embeddings import get_embeddings
+from app.services.hybrid_search import hybrid_search
+from app.services.lazy import lazy_resource
+from app.services.response_cache import get_cache
+from app.services.timings import start_timings, stage, collect_timings
+from app.services.topic_router import classify_topic, classify_topics
+from app.services.vectorstore import get_search_backend
 
 agri_advisory_bp = Blueprint('agri_advisory', __name__)
 
 # ==== CONFIGURATION ====
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-llm = LLM(api_key=GROQ_API_KEY, model="groq/llama-3.3-70b-versatile")
-
-# ==== VECTOR STORE ====
-EMBED_MODEL = "all-MiniLM-L6-v2"
-PERSIST_DIR = "../chroma_db"
-COLLECTION = "my_collection"
-
-embeddings = HuggingFaceEmbeddings(model_name=EMBED_MODEL)
-vectorstore = Chroma(
-    persist_directory=PERSIST_DIR,
-    embedding_function=embeddings,
-    collection_name=COLLECTION
-)
-retriever = vectorstore.as_retriever(search_type="similarity", search_kwargs={"k": 3})
+
+# crewai and langchain are imported inside the factories below so that
+# importing this blueprint stays cheap; everything is built on first use.
+# The vector store itself lives in app.services.vectorstore.
+
+@lazy_resource("advisory.llm")
+def get_llm():
+    from crewai import LLM
+    return LLM(api_key=GROQ_API_KEY, model="groq/llama-3.3-70b-versatile")
+
+
+@lazy_resource("advisory.qa_chain", enabled=lambda: Config.ADVISORY_RETRIEVAL_MODE == "qa")
+def get_qa_chain():
+    # Retrieval happens in retrieve_chunks, so only the "stuff" QA step is needed
+    from langchain.chains.question_answering import load_qa_chain
+    return load_qa_chain(llm=get_llm(), chain_type="stuff")
+
+def retrieve_chunks(query, k=None):
+    k = k or Config.ADVISORY_RETRIEVAL_K
+    with stage("embedding"):
+        vector = get_embeddings().embed_query(query)
+    if Config.RETRIEVER_MODE == "hybrid":
+        return hybrid_search(query, vector, get_search_backend(), k)
+    with stage("search"):
+        return get_search_backend().similarity_search_by_vector(vector, k=k)
+
+def format_chunks(docs):
+    if not docs:
+        return "No relevant passages found in the agricultural documents."
+    passages = []
+    for rank, doc in enumerate(docs, start=1):
+        source = os.path.basename(str(doc.metadata.get("source", "unknown")))
+        page = doc.metadata.get("page")
+        label = f"{source}, page {page + 1}" if isinstance(page, int) else source
+        passages.append(f"[{rank}] ({label})\n{doc.page_content.strip()}")
+    return "\n\n".join(passages)
 
 # ==== TOOL ====
-@tool("RAG Search Tool")
-def retrieve_context(query: str) -> str:
-    """Retrieve context from agricultural documents."""
-    qa = RetrievalQA.from_chain_type(llm=llm, retriever=retriever, chain_type="stuff")
-    return qa.run(query)
+@lazy_resource("advisory.rag_tool")
+def get_retrieve_context_tool():
+    from crewai.tools import tool
+
+    @tool("RAG Search Tool")
+    def retrieve_context(query: str) -> str:
+        """Retrieve context from agricultural documents."""
+        docs = retrieve_chunks(query)
+        if Config.ADVISORY_RETRIEVAL_MODE == "qa":
+            # Answer over the retrieved passages with the chain built once
+            with stage("llm"):
+                return get_qa_chain().run(input_documents=docs, question=query)
+        # Default: hand the ranked passages straight to the agent's own LLM call
+        return format_chunks(docs)
+
+    return retrieve_context
 
 # ==== AGENTS ====
+AGENT_SPECS = {
+    "agri_advisor": dict(
+        role="Agricultural Advisor",
+        goal="Provide optimal crop practices and resource suggestions.",
+        backstory="Expert in crop patterns, fertilizers, and modern techniques."
+    ),
+    "pest_diagnoser": dict(
+        role="Pest & Disease Assistant",
+        goal="Identify possible pests or diseases and suggest treatment.",
+        backstory="Expert in crop pathology and pest management."
+    ),
+    "organic_expert": dict(
+        role="Organic Farming Advisor",
+        goal="Promote eco-friendly farming with natural alternatives.",
+        backstory="Experienced organic farmer with in-depth knowledge of sustainable practices."
+    ),
+    "govt_scheme_expert": dict(
+        role="Schemes & Subsidy Assistant",
+        goal="Inform farmers about relevant schemes and how to apply.",
+        backstory="Government schemes specialist for rural development."
+    ),
+    "soil_analyzer": dict(
+        role="Soil Health Analyzer",
+        goal="Interpret soil health reports and suggest improvements.",
+        backstory="Soil scientist trained in analyzing pH, nutrients, and productivity indicators."
+    )
+}
+
+# {topic} is filled in by crew.kickoff(inputs=...), so tasks can be reused
+CATEGORY_TASKS = {
+    "agriculture": dict(
+        agent="agri_advisor",
+        description="Give agricultural advice for the query: '{topic}'.",
+        expected_output="List of crop practices, irrigation tips, and fertilizer suggestions."
+    ),
+    "pest": dict(
+        agent="pest_diagnoser",
+        description="Diagnose pests/diseases and suggest remedies for: '{topic}'.",
+        expected_output="List of symptoms, possible pests/diseases, and treatment options."
+    ),
+    "organic": dict(
+        agent="organic_expert",
+        description="Suggest organic farming practices for: '{topic}'.",
+        expected_output="List of eco-friendly farming methods and natural pesticides/fertilizers."
+    ),
+    "scheme": dict(
+        agent="govt_scheme_expert",
+        description="Find government schemes related to: '{topic}'.",
+        expected_output="List of schemes, benefits, eligibility, and application process."
+    ),
+    "soil": dict(
+        agent="soil_analyzer",
+        description="Analyze soil health for: '{topic}' and suggest improvements.",
+        expected_output="Interpretation of soil properties and recommended actions."
+    )
+}
+
+SHARED_CONTEXT_SUFFIX = (
+    "\n\nReference passages already retrieved from the agricultural documents "
+    "for this question:\n{context}"
+)
+
+def create_agent(name, with_tools=True):
+    from crewai import Agent
+
+    return Agent(
+        **AGENT_SPECS[name],
+        tools=[get_retrieve_context_tool()] if with_tools else [],
+        llm=get_llm(),
+        verbose=True
+    )
+
 def create_agents():
-    return {
-        "agri_advisor": Agent(
-            role="Agricultural Advisor",
-            goal="Provide optimal crop practices and resource suggestions.",
-            backstory="Expert in crop patterns, fertilizers, and modern techniques.",
-            tools=[retrieve_context],
-            llm=llm,
-            verbose=True
-        ),
-        "pest_diagnoser": Agent(
-            role="Pest & Disease Assistant",
-            goal="Identify possible pests or diseases and suggest treatment.",
-            backstory="Expert in crop pathology and pest management.",
-            tools=[retrieve_context],
-            llm=llm,
-            verbose=True
-        ),
-        "organic_expert": Agent(
-            role="Organic Farming Advisor",
-            goal="Promote eco-friendly farming with natural alternatives.",
-            backstory="Experienced organic farmer with in-depth knowledge of sustainable practices.",
-            tools=[retrieve_context],
-            llm=llm,
-            verbose=True
-        ),
-        "govt_scheme_expert": Agent(
-            role="Schemes & Subsidy Assistant",
-            goal="Inform farmers about relevant schemes and how to apply.",
-            backstory="Government schemes specialist for rural development.",
-            tools=[retrieve_context],
-            llm=llm,
-            verbose=True
-        ),
-        "soil_analyzer": Agent(
-            role="Soil Health Analyzer",
-            goal="Interpret soil health reports and suggest improvements.",
-            backstory="Soil scientist trained in analyzing pH, nutrients, and productivity indicators.",
-            tools=[retrieve_context],
-            llm=llm,
-            verbose=True
-        )
-    }
-
-# ==== CATEGORY CLASSIFIER ====
-def classify_topic(topic: str) -> str:
-    topic_lower = topic.lower()
-    if any(kw in topic_lower for kw in ["pest", "disease", "infection", "infestation", "worm", "fungus"]):
-        return "pest"
-    elif any(kw in topic_lower for kw in ["organic", "natural", "bio", "eco-friendly"]):
-        return "organic"
-    elif any(kw in topic_lower for kw in ["scheme", "subsidy", "government", "loan", "kisan"]):
-        return "scheme"
-    elif any(kw in topic_lower for kw in ["soil", "ph", "nitrogen", "potassium", "fertility"]):
-        return "soil"
-    else:
-        return "agriculture"
+    return {name: create_agent(name) for name in AGENT_SPECS}
+
+def create_crew(category, shared_context=False):
+    """A single-agent crew for ``category``; its task reads ``{topic}`` from inputs.
+
+    With ``shared_context`` the task also reads pre-retrieved passages from
+    ``{context}`` and the agent gets no retrieval tool of its own.
+    """
+    from crewai import Task, Crew, Process
+
+    spec = CATEGORY_TASKS[category]
+    agent = create_agent(spec["agent"], with_tools=not shared_context)
+    task = Task(
+        description=spec["description"] + (SHARED_CONTEXT_SUFFIX if shared_context else ""),
+        expected_output=spec["expected_output"],
+        agent=agent
+    )
+    return Crew(
+        agents=[agent],
+        tasks=[task],
+        process=Process.sequential,
+        verbose=True
+    )
+
+class CrewPool:
+    """Reusable single-agent crews per category.
+
+    Agents, tasks and crews keep per-run state, so one crew serves one
+    request at a time: ``borrow`` hands out an idle crew (building one when
+    all are busy) and puts it back afterwards, keeping at most
+    ``max_idle`` idle crews per category.
+    """
+
+    def __init__(self, max_idle):
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.stats = {"reused": 0, "built": 0}
+
+    @contextmanager
+    def borrow(self, category, shared_context=False):
+        key = (category, shared_context)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            crew = idle.pop() if idle else None
+            self.stats["reused" if crew else "built"] += 1
+        if crew is None:
+            crew = create_crew(category, shared_context)
+        yield crew
+        # Only crews whose run finished cleanly go back into the pool
+        with self._lock:
+            idle = self._idle[key]
+            if len(idle) < self.max_idle:
+                idle.append(crew)
+
+crew_pool = CrewPool(max_idle=Config.ADVISORY_CREW_POOL_SIZE)
+
+# ==== PARALLEL MODE ====
+@lazy_resource("advisory.executor")
+def get_parallel_executor():
+    return ThreadPoolExecutor(
+        max_workers=Config.ADVISORY_PARALLEL_WORKERS,
+        thread_name_prefix="advisory"
+    )
+
+def run_category(category, topic, context):
+    with crew_pool.borrow(category, shared_context=True) as crew:
+        return str(crew.kickoff(inputs={"topic": topic, "context": context}))
+
+def run_parallel(topic, categories):
+    """Run one agent per category concurrently over a single shared retrieval.
+
+    Returns ``(merged_markdown, {category: output}, timed_out_categories)``;
+    agents still running at ``ADVISORY_DEADLINE`` are left out of the merge,
+    and those that had not started yet are cancelled.
+    """
+    with stage("retrieval"):
+        context = format_chunks(retrieve_chunks(topic))
+
+    executor = get_parallel_executor()
+    futures = {executor.submit(run_category, category, topic, context): category for category in categories}
+    with stage("agents"):
+        wait(futures, timeout=Config.ADVISORY_DEADLINE)
+
+    outputs, timed_out = {}, []
+    for future, category in futures.items():
+        if not future.done():
+            # Queued agents would otherwise still run and hold pool workers
+            future.cancel()
+            timed_out.append(category)
+        elif future.exception() is not None:
+            print(f"[ERROR] {category} agent failed: {future.exception()}")
+        else:
+            outputs[category] = future.result()
+
+    if not outputs:
+        raise RuntimeError("No advisory agent finished before the deadline")
+
+    sections = []
+    for category in categories:
+        if category in outputs:
+            role = AGENT_SPECS[CATEGORY_TASKS[category]["agent"]]["role"]
+            sections.append(f"## {role}\n\n{outputs[category].strip()}")
+    return "\n\n".join(sections), outputs, timed_out
 
 # ==== ROUTE ====
 @agri_advisory_bp.route('/advisory/ask', methods=['POST'])
 def advisory():
     data = request.get_json()
     topic = data.get("topic")
+    mode = data.get("mode")
 
     if not topic:
         return jsonify({"error": "Missing 'topic' in request body"}), 400
 
-    agents = create_agents()
-    category = classify_topic(topic)
-
-    category_to_task = {
-        "agriculture": Task(
-            description=f"Give agricultural advice for the query: '{topic}'.",
-            expected_output="List of crop practices, irrigation tips, and fertilizer suggestions.",
-            agent=agents["agri_advisor"]
-        ),
-        "pest": Task(
-            description=f"Diagnose pests/diseases and suggest remedies for: '{topic}'.",
-            expected_output="List of symptoms, possible pests/diseases, and treatment options.",
-            agent=agents["pest_diagnoser"]
-        ),
-        "organic": Task(
-            description=f"Suggest organic farming practices for: '{topic}'.",
-            expected_output="List of eco-friendly farming methods and natural pesticides/fertilizers.",
-            agent=agents["organic_expert"]
-        ),
-        "scheme": Task(
-            description=f"Find government schemes related to: '{topic}'.",
-            expected_output="List of schemes, benefits, eligibility, and application process.",
-            agent=agents["govt_scheme_expert"]
-        ),
-        "soil": Task(
-            description=f"Analyze soil health for: '{topic}' and suggest improvements.",
-            expected_output="Interpretation of soil properties and recommended actions.",
-            agent=agents["soil_analyzer"]
-        )
-    }
-
-    selected_task = category_to_task[category]
-    selected_agent = selected_task.agent
-
-    crew = Crew(
-        agents=[selected_agent],
-        tasks=[selected_task],
-        process=Process.sequential,
-        verbose=True
-    )
-
+    start_timings()
     try:
-        result = crew.kickoff(inputs={"topic": topic})
-        return jsonify({
+        cache = get_cache("advisory")
+        cache_params = {"mode": mode} if mode == "parallel" else {}
+        cached = cache.get(cache_params, topic) if cache else None
+        if cached is not None:
+            return jsonify({**cached, "cached": True})
+
+        if mode == "parallel":
+            return advisory_parallel(topic, cache, cache_params)
+
+        with stage("routing"):
+            category = classify_topic(topic)
+
+        with stage("agent"), crew_pool.borrow(category) as crew:
+            result = crew.kickoff(inputs={"topic": topic})
+        timings = collect_timings()
+        print(f"[ADVISORY] stage timings: {timings}")
+        response = {
             "result": str(result),
             "selected_category": category
-        })
+        }
+        if cache:
+            cache.set(cache_params, response, topic)
+        return jsonify({**response, "timings": timings})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def advisory_parallel(topic, cache, cache_params):
+    try:
+        with stage("routing"):
+            categories = classify_topics(topic)[:Config.ADVISORY_MAX_AGENTS]
+
+        merged, outputs, timed_out = run_parallel(topic, categories)
+        timings = collect_timings()
+        print(f"[ADVISORY] parallel stage timings: {timings}")
+        response = {
+            "result": merged,
+            "selected_category": categories[0],
+            "selected_categories": categories,
+            "results": outputs,
+            "timed_out": timed_out
+        }
+        # Partial answers (an agent missed the deadline) are not cached
+        if cache and not timed_out and len(outputs) == len(categories):
+            cache.set(cache_params, response, topic)
+        return jsonify({**response, "timings": timings})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -1,10 +1,16 @@
-from flask import Blueprint, request, jsonify
-import requests
-import os
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 import datetime
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
-from groq import Groq
+from app.config import Config
+from app.services.fanout import fan_out, get_executor
+from app.services.lazy import lazy_resource
+from app.services.llm_client import chat_completion, get_session
+from app.services.npk import calculate_npk, render_markdown, to_plain_units
+from app.services.soil_cache import get_soil_cache, grid_cell, cell_center
+from app.services.weather_cache import get_weather_cache
 
 load_dotenv()
 
@@ -50,9 +56,7 @@ Use clear, jargon‑free language, and localize units & terminology for Indian f
 
 # ─── LLM FUNCTION ─────────────────────────────────────────────────────────────
 
-def get_fertilizer_recommendation(data, crop):
-    client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-
+def get_fertilizer_recommendation(data, crop, npk_plan=None):
     user_prompt = f"""
 Provide a fertilizer recommendation for the crop: **{crop}** using the following data:
 
@@ -75,9 +79,14 @@ Weather Data:
 Current Timestamp: {data['timestamp']}
 
 Tailor your advice to the crop {crop} and commercial agricultural standards.
+"""
+    if npk_plan:
+        user_prompt += f"""
+Computed nutrient plan (use exactly these rates in your advice and summary table; explain them, do not change them):
+{npk_plan['summary_table']}
 """
 
-    chat_completion = client.chat.completions.create(
+    content = chat_completion(
         model="llama3-70b-8192",
         messages=[
             {"role": "system", "content": FERTILIZER_SYSTEM_PROMPT},
@@ -86,13 +95,13 @@ Tailor your advice to the crop {crop} and commercial agricultural standards.
         temperature=0.7
     )
 
-    return chat_completion.choices[0].message.content.strip()
+    return content.strip()
 
 # ─── HELPERS ──────────────────────────────────────────────────────────────────
 
 def get_location():
     try:
-        response = requests.get("http://ip-api.com/json/")
+        response = get_session().get("http://ip-api.com/json/", timeout=Config.UPSTREAM_TIMEOUT)
         data = response.json()
         return {
             "lat": data.get("lat"),
@@ -105,94 +114,137 @@ def get_location():
         print(f"[ERROR] Location fetch failed: {e}")
         return None
 
-def get_soil_data(lat, lon):
-    try:
-        url = (
-            f"https://api.openepi.io/soil/property?"
-            f"lon={lon}&lat={lat}&depths=0-5cm&depths=0-30cm&"
-            f"properties=phh2o&properties=nitrogen&properties=soc&properties=clay&"
-            f"values=mean"
-        )
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-
-        properties = data.get('properties', [])
-        soil_data = {
-            "soil_ph": None,
-            "soil_organic_carbon": None,
-            "soil_nitrogen": None,
-            "soil_clay": None
-        }
-
-        for prop in properties:
-            if prop['property'] == 'phh2o':
-                soil_data['soil_ph'] = prop['depth_0_5']['mean']
-            elif prop['property'] == 'nitrogen':
-                soil_data['soil_nitrogen'] = prop['depth_0_5']['mean']
-            elif prop['property'] == 'soc':
-                soil_data['soil_organic_carbon'] = prop['depth_0_5']['mean']
-            elif prop['property'] == 'clay':
-                soil_data['soil_clay'] = prop['depth_0_5']['mean']
-
-        ocs_url = (
-            f"https://api.openepi.io/soil/property?"
-            f"lon={lon}&lat={lat}&depths=0-30cm&properties=ocs&values=mean"
-        )
-        ocs_response = requests.get(ocs_url)
-        if ocs_response.status_code == 200:
-            ocs_data = ocs_response.json()
-            for prop in ocs_data.get('properties', []):
-                if prop['property'] == 'ocs':
-                    soil_data['soil_organic_carbon_stock'] = prop['depth_0_30']['mean']
-
-        defaults = {
-            "soil_ph": 6.5,
-            "soil_organic_carbon": 1.2,
-            "soil_nitrogen": 0.1,
-            "soil_clay": 20.0,
-            "soil_organic_carbon_stock": 50.0
-        }
+SOIL_DEFAULTS = {
+    "soil_ph": 6.5,
+    "soil_organic_carbon": 1.2,
+    "soil_nitrogen": 0.1,
+    "soil_clay": 20.0,
+    "soil_organic_carbon_stock": 50.0
+}
 
-        for key in defaults:
-            if soil_data.get(key) is None:
-                soil_data[key] = defaults[key]
-
-        return soil_data
-
-    except Exception as e:
-        print(f"[ERROR] Soil data fetch failed: {e}")
-        return {
-            "soil_ph": 6.5,
-            "soil_organic_carbon": 1.2,
-            "soil_nitrogen": 0.1,
-            "soil_clay": 20.0,
-            "soil_organic_carbon_stock": 50.0
-        }
+def get_soil_data(lat, lon):
+    # Soil is looked up once per grid cell (at the cell centre) and persisted
+    cache = get_soil_cache()
+    cell = grid_cell(lat, lon, cache.resolution)
+    cached = cache.get(cell)
+    if cached:
+        return cached[0]
+
+    soil_data, defaulted = fetch_soil_data(*cell_center(cell, cache.resolution))
+    # Don't pin a cell to pure defaults when the upstream was simply down
+    if len(defaulted) < len(SOIL_DEFAULTS):
+        cache.set(cell, soil_data, defaulted)
+    return soil_data
+
+def fetch_soil_data(lat, lon):
+    """Query OpenEPI; returns (soil_data, names of fields filled from defaults)."""
+    # The property and ocs queries are independent, so run them side by side
+    results = fan_out({
+        "soil properties": (fetch_soil_properties, (lat, lon), {}),
+        "soil ocs": (fetch_soil_ocs, (lat, lon), {})
+    })
+
+    soil_data = {key: None for key in SOIL_DEFAULTS}
+    for values in results.values():
+        soil_data.update(values)
+
+    defaulted = [key for key, value in soil_data.items() if value is None]
+    for key in defaulted:
+        soil_data[key] = SOIL_DEFAULTS[key]
+
+    return soil_data, defaulted
+
+def fetch_soil_properties(lat, lon):
+    url = (
+        f"https://api.openepi.io/soil/property?"
+        f"lon={lon}&lat={lat}&depths=0-5cm&depths=0-30cm&"
+        f"properties=phh2o&properties=nitrogen&properties=soc&properties=clay&"
+        f"values=mean"
+    )
+    response = get_session().get(url, timeout=Config.UPSTREAM_TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+
+    # OpenEPI returns SoilGrids mapped units; store pH and % like the defaults
+    fields = {
+        'phh2o': 'soil_ph',
+        'nitrogen': 'soil_nitrogen',
+        'soc': 'soil_organic_carbon',
+        'clay': 'soil_clay'
+    }
+    soil_data = {}
+    for prop in data.get('properties', []):
+        key = fields.get(prop['property'])
+        if key:
+            soil_data[key] = to_plain_units(key, prop['depth_0_5']['mean'])
+    return soil_data
+
+def fetch_soil_ocs(lat, lon):
+    ocs_url = (
+        f"https://api.openepi.io/soil/property?"
+        f"lon={lon}&lat={lat}&depths=0-30cm&properties=ocs&values=mean"
+    )
+    ocs_response = get_session().get(ocs_url, timeout=Config.UPSTREAM_TIMEOUT)
+    ocs_response.raise_for_status()
+
+    soil_data = {}
+    for prop in ocs_response.json().get('properties', []):
+        if prop['property'] == 'ocs':
+            soil_data['soil_organic_carbon_stock'] = prop['depth_0_30']['mean']
+    return soil_data
+
+WEATHER_DEFAULTS = {
+    "temperature": 30,
+    "humidity": 50,
+    "precipitation": 0,
+    "windspeed": 10
+}
 
 def get_weather(lat, lon):
     try:
-        url = (
-            f"https://api.open-meteo.com/v1/forecast"
-            f"?latitude={lat}&longitude={lon}&current_weather=true&hourly=relativehumidity_2m,precipitation"
-        )
-        response = requests.get(url)
-        data = response.json()
-
-        return {
-            "temperature": data.get("current_weather", {}).get("temperature", 30),
-            "humidity": data.get("hourly", {}).get("relativehumidity_2m", [50])[0],
-            "precipitation": data.get("hourly", {}).get("precipitation", [0])[0],
-            "windspeed": data.get("current_weather", {}).get("windspeed", 10)
-        }
+        # Hourly forecast per grid cell, sliced to the current hour
+        return get_weather_cache().current(lat, lon)
     except Exception as e:
         print(f"[ERROR] Weather data fetch failed: {e}")
-        return {
-            "temperature": 30,
-            "humidity": 50,
-            "precipitation": 0,
-            "windspeed": 10
-        }
+        return dict(WEATHER_DEFAULTS)
+
+def soil_bucket(soil_data):
+    """Soil values rounded to two significant figures, for grouping plots."""
+    return tuple(
+        (key, float(f"{float(soil_data[key]):.2g}") if soil_data.get(key) is not None else None)
+        for key in SOIL_DEFAULTS
+    )
+
+@lazy_resource("fertilizer.batch_executor")
+def get_batch_executor():
+    """Shared pool that bounds concurrent batch LLM calls across requests."""
+    return ThreadPoolExecutor(
+        max_workers=Config.BATCH_LLM_CONCURRENCY,
+        thread_name_prefix="fertilizer-batch"
+    )
+
+def recommend(crop, location, soil_data, weather, mode=None):
+    """Return (npk_plan, recommendation text).
+
+    The numbers always come from the local NPK calculator; ``mode="fast"``
+    skips the LLM and returns the calculator's own summary as the text.
+    """
+    npk_plan = calculate_npk(crop, soil_data, weather)
+    if mode == "fast":
+        return npk_plan, render_markdown(npk_plan)
+
+    input_data = {
+        "location": location,
+        "soil_data": soil_data,
+        "weather_data": weather,
+        "timestamp": datetime.datetime.now().isoformat()
+    }
+    return npk_plan, get_fertilizer_recommendation(input_data, crop, npk_plan)
+
+def recommend_for_group(crop, location, soil_data, mode=None):
+    weather = get_weather(location.get("lat"), location.get("lon"))
+    npk_plan, recommendation = recommend(crop, location, soil_data, weather, mode)
+    return weather, npk_plan, recommendation
 
 # ─── ROUTE 1: FARM DATA (location + soil) ─────────────────────────────────────
 
@@ -203,6 +255,8 @@ def farm_data_route():
         if not location:
             return jsonify({"error": "Could not determine location"}), 500
 
+        # Warm the weather cache for the recommendation call that usually follows
+        get_executor().submit(get_weather, location["lat"], location["lon"])
         soil = get_soil_data(location["lat"], location["lon"])
         return jsonify({
             "location": location,
@@ -221,22 +275,17 @@ def fertilizer_route():
         crop = req_json.get("crop")
         location = req_json.get("location")
         soil_data = req_json.get("soil_data")
+        mode = req_json.get("mode") or request.args.get("mode")
 
         if not all([crop, location, soil_data]):
             return jsonify({"error": "Missing required fields: crop, location, or soil_data"}), 400
 
         lat = location.get("lat")
         lon = location.get("lon")
-        weather = get_weather(lat, lon)
-
-        input_data = {
-            "location": location,
-            "soil_data": soil_data,
-            "weather_data": weather,
-            "timestamp": datetime.datetime.now().isoformat()
-        }
+        # Hard deadline: fall back to the default weather if Open-Meteo is slow
+        weather = fan_out({"weather": (get_weather, (lat, lon), dict(WEATHER_DEFAULTS))})["weather"]
 
-        llm_response = get_fertilizer_recommendation(input_data, crop)
+        npk_plan, recommendation = recommend(crop, location, soil_data, weather, mode)
 
         return jsonify({
             "status": "success",
@@ -244,8 +293,90 @@ def fertilizer_route():
             "location": location,
             "soil_data": soil_data,
             "weather_data": weather,
-            "recommendation": llm_response
+            "npk_plan": npk_plan,
+            "recommendation": recommendation
         })
 
     except Exception as e:
         return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+
+# ─── ROUTE 3: BATCH FERTILIZER RECOMMENDATION (NDJSON) ────────────────────────
+
+@fertilizer_bp.route("/api/fertilizer_recommendation/batch", methods=["POST"])
+def fertilizer_batch_route():
+    req_json = request.get_json(silent=True) or {}
+    plots = req_json.get("plots")
+    mode = req_json.get("mode") or request.args.get("mode")
+
+    if not isinstance(plots, list) or not plots:
+        return jsonify({"error": "Missing required field: plots (non-empty list)"}), 400
+    if len(plots) > Config.BATCH_MAX_PLOTS:
+        return jsonify({"error": f"Too many plots (max {Config.BATCH_MAX_PLOTS})"}), 400
+
+    # Plots sharing crop, soil bucket and weather cell get one recommendation
+    groups = {}
+    invalid = []
+    resolution = get_weather_cache().resolution
+    for index, plot in enumerate(plots):
+        # One malformed row must not fail the whole batch
+        if not isinstance(plot, dict):
+            invalid.append(index)
+            continue
+        crop = plot.get("crop")
+        location = plot.get("location")
+        soil_data = plot.get("soil_data")
+        if not (isinstance(crop, str) and crop.strip()
+                and isinstance(location, dict) and isinstance(soil_data, dict) and soil_data):
+            invalid.append(index)
+            continue
+        try:
+            key = (
+                crop.strip().lower(),
+                soil_bucket(soil_data),
+                grid_cell(location.get("lat"), location.get("lon"), resolution)
+            )
+        except (TypeError, ValueError):
+            invalid.append(index)
+            continue
+        groups.setdefault(key, []).append(index)
+
+    def generate():
+        for index in invalid:
+            plot = plots[index]
+            yield json.dumps({
+                "index": index,
+                "id": plot.get("id") if isinstance(plot, dict) else None,
+                "status": "error",
+                "error": "Missing or invalid fields: crop, location, or soil_data"
+            }) + "\n"
+
+        executor = get_batch_executor()
+        futures = {}
+        for members in groups.values():
+            first = plots[members[0]]
+            future = executor.submit(recommend_for_group, first["crop"], first["location"], first["soil_data"], mode)
+            futures[future] = members
+
+        for future in as_completed(futures):
+            members = futures[future]
+            try:
+                weather, npk_plan, recommendation = future.result()
+                result = {
+                    "status": "success",
+                    "weather_data": weather,
+                    "npk_plan": npk_plan,
+                    "recommendation": recommendation
+                }
+            except Exception as e:
+                result = {"status": "error", "error": f"Internal server error: {str(e)}"}
+            for index in members:
+                plot = plots[index]
+                yield json.dumps({
+                    "index": index,
+                    "id": plot.get("id"),
+                    "crop": plot["crop"],
+                    "shared_with": len(members),
+                    **result
+                }) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
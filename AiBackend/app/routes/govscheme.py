@@ -1,14 +1,13 @@
 # govscheme_bp.py
 
 from flask import Blueprint, request, jsonify
-import requests
-import os
+
+from app.services.llm_client import post_chat, stream_chat
+from app.services.response_cache import get_cache
+from app.services.streaming import wants_stream, stream_completion, sse_response
 
 govscheme_bp = Blueprint('govscheme', __name__)
 
-print(os.environ.get("GROQ_API_KEY"))
-GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
-GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
 MODEL_ID = "llama-3.3-70b-versatile"
 
 SYSTEM_PROMPT = """
@@ -38,10 +37,12 @@ def get_gov_scheme_info():
         if not user_query:
             return jsonify({"error": "Query not provided"}), 400
 
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json"
-        }
+        cache = get_cache("govscheme")
+        cached = cache.get({}, user_query) if cache else None
+        if cached is not None:
+            if wants_stream():
+                return sse_response(stream_completion(iter([cached]), query=user_query, cached=True))
+            return jsonify({"query": user_query, "response": cached, "cached": True})
 
         payload = {
             "model": MODEL_ID,
@@ -53,13 +54,19 @@ def get_gov_scheme_info():
             "max_tokens": 1024
         }
 
-        response = requests.post(GROQ_URL, headers=headers, json=payload)
+        if wants_stream():
+            on_complete = (lambda text: cache.set({}, text, user_query)) if cache else None
+            return sse_response(stream_completion(stream_chat(payload), on_complete=on_complete, query=user_query))
+
+        response = post_chat(payload)
 
         if response.status_code != 200:
             return jsonify({"error": "Groq API error", "details": response.json()}), 500
 
         result = response.json()
         answer = result['choices'][0]['message']['content']
+        if cache:
+            cache.set({}, answer, user_query)
 
         return jsonify({
             "query": user_query,
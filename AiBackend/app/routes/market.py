@@ -1,12 +1,11 @@
 import os
 from flask import Blueprint, request, jsonify
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from langchain.prompts import ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from typing import List
 
+from app.services.lazy import lazy_resource
+
 # Load environment variables
 load_dotenv()
 
@@ -28,20 +27,28 @@ class AgricultureData(BaseModel):
     weather: List[WeatherInfo] = Field(default=[])
     market_prices: List[MarketInfo] = Field(default=[])
 
-parser = PydanticOutputParser(pydantic_object=AgricultureData)
+# ✅ Step 2: LangChain + Groq chain, built on first use
+@lazy_resource("market.chain")
+def get_chain():
+    from langchain_groq import ChatGroq
+    from langchain.prompts import ChatPromptTemplate
+    from langchain.output_parsers import PydanticOutputParser
+
+    parser = PydanticOutputParser(pydantic_object=AgricultureData)
 
-# ✅ Step 2: LangChain + Groq Model Setup
-llm = ChatGroq(
-    temperature=0,
-    model_name="compound-beta",  # Enables web + code tools
-    api_key=os.getenv("GROQ_API_KEY")
-)
+    llm = ChatGroq(
+        temperature=0,
+        model_name="compound-beta",  # Enables web + code tools
+        api_key=os.getenv("GROQ_API_KEY")
+    )
 
-# ✅ Step 3: LangChain Prompt Template
-prompt = ChatPromptTemplate.from_messages([
-    ("system", "You are an assistant that gives Indian farmers real-time weather info and market prices."),
-    ("user", "Give structured weather reports for {cities} and market prices for {crops} in India. Format output as per schema: {format_instructions}")
-])
+    # ✅ Step 3: LangChain Prompt Template
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "You are an assistant that gives Indian farmers real-time weather info and market prices."),
+        ("user", "Give structured weather reports for {cities} and market prices for {crops} in India. Format output as per schema: {format_instructions}")
+    ])
+
+    return prompt | llm | parser, parser.get_format_instructions()
 
 @weather_market_bp.route("/api/weather-market", methods=["GET"])
 def weather_market():
@@ -51,9 +58,7 @@ def weather_market():
         cities = [city.strip() for city in cities if city.strip()]
         crops = [crop.strip() for crop in crops if crop.strip()]
 
-        format_instructions = parser.get_format_instructions()
-
-        chain = prompt | llm | parser
+        chain, format_instructions = get_chain()
         result: AgricultureData = chain.invoke({
             "cities": ", ".join(cities),
             "crops": ", ".join(crops),
@@ -1,14 +1,16 @@
+from io import BytesIO
+
 from flask import Blueprint, request, jsonify
-import os
-import base64
 import requests
-from dotenv import load_dotenv
-from flask_cors import CORS
 
-load_dotenv()
+from app.config import Config
+from app.services.diagnosis_cache import get_diagnosis_cache
+from app.services.disease_classifier import get_disease_classifier, render_markdown
+from app.services.image_preprocess import detect_mimetype, image_fingerprint, preprocess_image
+from app.services.llm_client import post_chat_body
+from app.services.uploads import iter_blocks, json_body_with_data_url, upload_limit
 
 plant_disease_bp = Blueprint('plant_disease_bp', __name__)
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
 # Enable CORS for the blueprint
 @plant_disease_bp.after_request
@@ -18,7 +20,10 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
     return response
 
+IMAGE_PLACEHOLDER = "__IMAGE_DATA_URL__"
+
 @plant_disease_bp.route("/plant-disease", methods=["POST"])
+@upload_limit(Config.PLANT_DISEASE_MAX_UPLOAD_MB)
 def detect_plant_disease():
     # Debug the incoming request
     print('Content-Type:', request.headers.get('Content-Type', 'No Content-Type header'))
@@ -29,8 +34,48 @@ def detect_plant_disease():
     
     try:
         image_file = request.files['image']
-        image_bytes = image_file.read()
-        encoded_image = base64.b64encode(image_bytes).decode('utf-8')
+        if Config.IMAGE_PREPROCESS:
+            # Oriented, downsized, metadata-free JPEG/WebP: a small fraction of the photo
+            try:
+                image_bytes, mimetype, info = preprocess_image(image_file.stream)
+            except OSError:
+                return jsonify({"error": "Unsupported or corrupt image file."}), 400
+            fingerprint = (info["phash"], info["color"])
+            blocks = [image_bytes]
+        else:
+            mimetype = detect_mimetype(image_file.stream)
+            if mimetype is None:
+                return jsonify({"error": "Unsupported or corrupt image file."}), 400
+            fingerprint = image_fingerprint(image_file.stream) if Config.DIAGNOSIS_CACHE else None
+            blocks = iter_blocks(image_file)
+
+        # Same or nearly the same photo as a recent submission: reuse its diagnosis
+        cache = get_diagnosis_cache() if Config.DIAGNOSIS_CACHE else None
+        if cache is not None:
+            diagnosis = cache.get(*fingerprint)
+            if diagnosis is not None:
+                return jsonify({"diagnosis": diagnosis, "cached": True}), 200
+
+        # Local triage: confident predictions are answered on the CPU, the rest
+        # (and requests asking for detailed treatment) go to the vision model
+        detail = str(request.form.get("detail", "")).strip().lower() in ("1", "true", "yes")
+        if Config.DISEASE_CLASSIFIER_MODEL and not detail:
+            try:
+                classifier = get_disease_classifier()
+                source = BytesIO(blocks[0]) if Config.IMAGE_PREPROCESS else image_file.stream
+                label, confidence, elapsed_ms = classifier.predict(source)
+                local = confidence >= Config.DISEASE_CLASSIFIER_THRESHOLD
+                classifier.record(local, elapsed_ms)
+            except Exception as e:
+                print(f"[ERROR] Local disease classifier failed, escalating: {e}")
+                local = False
+            if local:
+                return jsonify({
+                    "diagnosis": render_markdown(label, confidence),
+                    "label": label,
+                    "confidence": round(confidence, 3),
+                    "source": "local"
+                }), 200
         
         prompt = (
             "You are an agricultural expert. Analyze the uploaded image of a plant or leaf and identify any diseases, pests, or deficiencies present. "
@@ -43,21 +88,24 @@ def detect_plant_disease():
             "messages": [
                 {"role": "system", "content": prompt},
                 {"role": "user", "content": [
-                    {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{encoded_image}"}}
+                    {"type": "image_url", "image_url": {"url": IMAGE_PLACEHOLDER}}
                 ]}
             ],
             "temperature": 0.4
         }
         
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        response = requests.post("https://api.groq.com/openai/v1/chat/completions", headers=headers, json=payload)
+        # The image is base64-encoded block by block straight into the request body
+        with json_body_with_data_url(payload, IMAGE_PLACEHOLDER, blocks, mimetype) as body:
+            response = post_chat_body(body)
         response.raise_for_status()
         result = response.json()
         diagnosis = result["choices"][0]["message"]["content"]
+        if cache is not None:
+            try:
+                cache.set(*fingerprint, diagnosis)
+            except Exception as e:
+                # The diagnosis is still good; only its reuse is lost
+                print(f"[ERROR] Diagnosis cache write failed: {e}")
         return jsonify({"diagnosis": diagnosis}), 200
     
     except requests.exceptions.RequestException as e:
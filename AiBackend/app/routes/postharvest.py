@@ -1,12 +1,11 @@
 from flask import Blueprint, request, jsonify
-import os
 import requests
-from dotenv import load_dotenv
 
-load_dotenv()
+from app.services.llm_client import post_chat, stream_chat
+from app.services.response_cache import get_cache
+from app.services.streaming import wants_stream, stream_completion, sse_response
 
 postharvest_bp = Blueprint('postharvest_bp', __name__)
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
 @postharvest_bp.route("/postharvest", methods=["POST"])
 def postharvest_instructions():
@@ -18,6 +17,14 @@ def postharvest_instructions():
     if not crop or not harvest_date:
         return jsonify({"error": "Missing 'crop' or 'harvest_date' in request."}), 400
 
+    cache = get_cache("postharvest")
+    cache_params = {"crop": crop, "harvest_date": harvest_date, "region": region}
+    cached = cache.get(cache_params) if cache else None
+    if cached is not None:
+        if wants_stream():
+            return sse_response(stream_completion(iter([cached]), crop=crop, region=region, cached=True))
+        return jsonify({"instructions": cached, "cached": True}), 200
+
     system_prompt = (
         "You are an agricultural expert specialized in post-harvest handling. "
         "Given the crop, harvest date, and region, provide practical and region-specific post-harvest instructions. "
@@ -43,15 +50,16 @@ def postharvest_instructions():
         "temperature": 0.5
     }
 
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    if wants_stream():
+        on_complete = (lambda text: cache.set(cache_params, text)) if cache else None
+        return sse_response(stream_completion(stream_chat(payload), on_complete=on_complete, crop=crop, region=region))
 
     try:
-        response = requests.post("https://api.groq.com/openai/v1/chat/completions", headers=headers, json=payload)
+        response = post_chat(payload)
         response.raise_for_status()
         reply = response.json()["choices"][0]["message"]["content"]
+        if cache:
+            cache.set(cache_params, reply)
         return jsonify({"instructions": reply}), 200
     except requests.exceptions.RequestException as e:
         return jsonify({"error": str(e)}), 500
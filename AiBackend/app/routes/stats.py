@@ -0,0 +1,32 @@
+from flask import Blueprint, jsonify
+
+from app.config import Config
+from app.services.diagnosis_cache import get_diagnosis_cache
+from app.services.document_cache import get_document_cache
+from app.services.response_cache import cache_stats
+from app.services.soil_cache import get_soil_cache
+from app.services.weather_cache import get_weather_cache
+
+stats_bp = Blueprint('stats', __name__)
+
+@stats_bp.route("/cache/stats", methods=["GET"])
+def get_cache_stats():
+    stats = {
+        "response_cache": cache_stats(),
+        "soil_cache": get_soil_cache().info(),
+        "weather_cache": get_weather_cache().info(),
+        "document_cache": get_document_cache().info(),
+        "diagnosis_cache": get_diagnosis_cache().info()
+    }
+    if Config.DISEASE_CLASSIFIER_MODEL:
+        from app.services.disease_classifier import get_disease_classifier
+        stats["disease_classifier"] = get_disease_classifier().info()
+    if Config.EMBED_SERVICE_SOCKET:
+        from app.services.embeddings import get_embeddings
+        embeddings = get_embeddings()
+        if hasattr(embeddings, "stats"):
+            try:
+                stats["embedding_service"] = embeddings.stats()
+            except Exception as e:
+                stats["embedding_service"] = {"error": str(e)}
+    return jsonify(stats)
@@ -1,15 +1,137 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
 from flask import Blueprint, request, jsonify
-import os
 import fitz  # PyMuPDF
-import requests
-from dotenv import load_dotenv
 
-load_dotenv()
+from app.config import Config
+from app.services.document_cache import get_document_cache
+from app.services.lazy import lazy_resource
+from app.services.llm_client import post_chat, stream_chat
+from app.services.streaming import wants_stream, stream_completion, sse_event, sse_response
+from app.services.text_chunks import chunk_pages, iter_pdf_pages
+from app.services.uploads import file_path, sha256_upload, upload_limit
 
 translate_bp = Blueprint('translate_bp', __name__)
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+MODEL = "llama-3.3-70b-versatile"
+PART_SEPARATOR = "\n\n"
+
+
+def system_prompt(target_language):
+    return (
+        "You are an expert in explaining agricultural and government documents to rural farmers. "
+        "Instead of directly translating, summarize and explain the content in very simple and clear terms "
+        f"in the target language ({target_language}). Use a farmer-friendly tone. Preserve any important data or rules, "
+        "but avoid complex language. If needed, use bullet points or sections for better clarity."
+    )
+
+
+def build_payload(text, target_language, part=None, total=None):
+    if total is None or total == 1:
+        prompt = f"Explain the following document in {target_language}:\n\n{text}"
+    else:
+        prompt = (
+            f"Explain the following part ({part} of {total}) of a longer document in {target_language}. "
+            "Cover only this part and do not add an introduction or conclusion for the whole document:"
+            f"\n\n{text}"
+        )
+    return {
+        "model": MODEL,
+        "messages": [
+            {"role": "system", "content": system_prompt(target_language)},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.4
+    }
+
+
+def explain(payload):
+    response = post_chat(payload)
+    response.raise_for_status()
+    return response.json()["choices"][0]["message"]["content"]
+
+
+@lazy_resource("translate.executor")
+def get_translate_executor():
+    """Shared pool that bounds concurrent chunk LLM calls across requests."""
+    return ThreadPoolExecutor(
+        max_workers=Config.TRANSLATE_MAX_PARALLEL,
+        thread_name_prefix="translate"
+    )
+
+
+def submit_chunks(chunks, target_language):
+    """Map step: one future per chunk, keyed back to its position."""
+    executor = get_translate_executor()
+    return {
+        executor.submit(explain, build_payload(chunk, target_language, index + 1, len(chunks))): index
+        for index, chunk in enumerate(chunks)
+    }
+
+
+def translate_chunks(chunks, target_language):
+    """Explain every chunk concurrently and join the parts in document order."""
+    futures = submit_chunks(chunks, target_language)
+    parts = [None] * len(chunks)
+    try:
+        for future in as_completed(futures):
+            parts[futures[future]] = future.result()
+    except Exception:
+        for future in futures:
+            future.cancel()
+        raise
+    return PART_SEPARATOR.join(parts)
+
+
+def stream_chunks(chunks, target_language, on_complete=None):
+    """SSE for multi-chunk documents.
+
+    ``progress`` events report finished chunks; each part is sent as a
+    ``token`` event as soon as it and every part before it are done, so the
+    client renders the document in order. Ends with the same ``done`` event
+    as ``stream_completion``; ``on_complete(text)`` runs before it.
+    """
+    start = time.perf_counter()
+    first_part = None
+    futures = submit_chunks(chunks, target_language)
+    parts = [None] * len(chunks)
+    released = 0
+    yield sse_event("progress", {"completed": 0, "total": len(chunks)})
+    try:
+        for completed, future in enumerate(as_completed(futures), start=1):
+            parts[futures[future]] = future.result()
+            yield sse_event("progress", {"completed": completed, "total": len(chunks)})
+            while released < len(parts) and parts[released] is not None:
+                if first_part is None:
+                    first_part = time.perf_counter() - start
+                content = (PART_SEPARATOR if released else "") + parts[released]
+                yield sse_event("token", {"content": content})
+                released += 1
+    except (requests.exceptions.RequestException, ValueError, KeyError, IndexError) as e:
+        for pending in futures:
+            pending.cancel()
+        yield sse_event("error", {"error": str(e)})
+        return
+
+    text = PART_SEPARATOR.join(parts)
+    if on_complete:
+        on_complete(text)
+    total = time.perf_counter() - start
+    yield sse_event("done", {
+        "target_language": target_language,
+        "chunks": len(chunks),
+        "text": text,
+        "timing": {
+            "time_to_first_token_ms": round((first_part or total) * 1000, 1),
+            "total_ms": round(total * 1000, 1)
+        }
+    })
+
 
 @translate_bp.route("/translate", methods=["POST"])
+@upload_limit(Config.TRANSLATE_MAX_UPLOAD_MB)
 def translate_document():
     if 'file' not in request.files:
         return jsonify({"error": "No PDF file provided."}), 400
@@ -21,46 +143,47 @@ def translate_document():
         return jsonify({"error": "No target language specified."}), 400
 
     try:
-        # Extract text from PDF
-        text = ""
-        with fitz.open(stream=pdf_file.read(), filetype="pdf") as doc:
-            for page in doc:
-                text += page.get_text()
-
-        if not text.strip():
-            return jsonify({"error": "PDF appears to be empty or unreadable."}), 400
+        # Hashed block by block; large uploads are already spooled to disk
+        sha256 = sha256_upload(pdf_file)
+        cache = get_document_cache()
 
-        # Updated system prompt for simplified explanation
-        system_prompt = (
-            "You are an expert in explaining agricultural and government documents to rural farmers. "
-            "Instead of directly translating, summarize and explain the content in very simple and clear terms "
-            f"in the target language ({target_language}). Use a farmer-friendly tone. Preserve any important data or rules, "
-            "but avoid complex language. If needed, use bullet points or sections for better clarity."
-        )
+        # Same PDF and language as before: no parsing, no LLM call
+        cached = cache.get_translation(sha256, target_language)
+        if cached is not None:
+            if wants_stream():
+                return sse_response(stream_completion([cached], target_language=target_language, cached=True))
+            return jsonify({"translated_document": cached}), 200
 
-        prompt = f"Explain the following document in {target_language}:\n\n{text.strip()}"
+        pages = cache.get_pages(sha256)
+        if pages is None:
+            # Extract text page by page
+            path = file_path(pdf_file)
+            source = {"filename": path} if path else {"stream": pdf_file.stream.getvalue()}
+            with fitz.open(filetype="pdf", **source) as doc:
+                pages = list(iter_pdf_pages(doc))
+            cache.set_pages(sha256, pages)
+        chunks = chunk_pages(pages, Config.TRANSLATE_CHUNK_TOKENS)
 
-        # Request to Groq
-        groq_url = "https://api.groq.com/openai/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        payload = {
-            "model": "llama-3.3-70b-versatile",
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.4
-        }
+        if not chunks:
+            return jsonify({"error": "PDF appears to be empty or unreadable."}), 400
 
-        response = requests.post(groq_url, headers=headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
+        def remember(text):
+            cache.set_translation(sha256, target_language, text)
 
-        translated_text = result["choices"][0]["message"]["content"]
+        # Documents that fit in one chunk keep the single-prompt path
+        if len(chunks) == 1:
+            payload = build_payload(chunks[0], target_language)
+            if wants_stream():
+                return sse_response(stream_completion(
+                    stream_chat(payload), on_complete=remember, target_language=target_language
+                ))
+            translated_text = explain(payload)
+        elif wants_stream():
+            return sse_response(stream_chunks(chunks, target_language, on_complete=remember))
+        else:
+            translated_text = translate_chunks(chunks, target_language)
 
+        remember(translated_text)
         return jsonify({"translated_document": translated_text}), 200
 
     except Exception as e:
@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import threading
+import time
+
+from app.config import Config
+from app.services.image_preprocess import color_distance
+from app.services.lazy import lazy_resource
+
+
+def _signed(value):
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+class DiagnosisCache:
+    """SQLite store of recent plant-disease diagnoses keyed by perceptual hash.
+
+    A new photo reuses a stored diagnosis when its 64-bit pHash is within
+    ``max_distance`` bits (Hamming) of one submitted in the last ``ttl``
+    seconds and its hue histogram is within ``max_color_distance`` — retries
+    and the same leaf shot twice skip the vision model, while the same leaf
+    turned yellow or brown (invisible to the grayscale pHash) does not.
+    The store keeps at most ``max_entries`` rows, oldest evicted first, and
+    is shared by all workers through the database file.
+    """
+
+    def __init__(self, path, max_distance, max_color_distance, ttl, max_entries):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_distance = max_distance
+        self.max_color_distance = max_color_distance
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(diagnoses)")]
+        if columns and "color" not in columns:
+            # Rows from before colour signatures cannot be matched safely
+            self._db.execute("DROP TABLE diagnoses")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS diagnoses ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " phash INTEGER NOT NULL,"
+            " color BLOB NOT NULL,"
+            " diagnosis TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._db.commit()
+        self.stats = {"hits": 0, "misses": 0, "exact_hits": 0}
+
+    def get(self, image_hash, color):
+        """Diagnosis of the closest recent match within both thresholds, or ``None``."""
+        import numpy as np
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT phash, color, diagnosis FROM diagnoses WHERE created_at > ?",
+                (time.time() - self.ttl,)
+            ).fetchall()
+        match = None
+        if rows:
+            hashes = np.asarray([row[0] for row in rows], dtype=np.int64).view(np.uint64)
+            xor = hashes ^ np.uint64(image_hash)
+            distances = np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+            colors = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.uint8).reshape(len(rows), -1)
+            color_distances = color_distance(color, colors)
+            eligible = np.flatnonzero(
+                (distances <= self.max_distance) & (color_distances <= self.max_color_distance)
+            )
+            if len(eligible):
+                best = eligible[np.lexsort((color_distances[eligible], distances[eligible]))[0]]
+                match = (rows[best][2], int(distances[best]))
+        with self._lock:
+            if match is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            if match[1] == 0:
+                self.stats["exact_hits"] += 1
+        return match[0]
+
+    def set(self, image_hash, color, diagnosis):
+        with self._lock:
+            now = time.time()
+            self._db.execute(
+                "INSERT INTO diagnoses (phash, color, diagnosis, created_at) VALUES (?, ?, ?, ?)",
+                (_signed(image_hash), color, diagnosis, now)
+            )
+            self._db.execute("DELETE FROM diagnoses WHERE created_at <= ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM diagnoses WHERE id NOT IN "
+                "(SELECT id FROM diagnoses ORDER BY id DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._db.commit()
+
+    def info(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM diagnoses").fetchone()[0]
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else None,
+                "entries": entries,
+                "max_distance": self.max_distance,
+                "max_color_distance": self.max_color_distance
+            }
+
+
+@lazy_resource("diagnosis_cache")
+def get_diagnosis_cache():
+    return DiagnosisCache(
+        os.path.join(Config.CACHE_DIR, "diagnoses.sqlite3"),
+        max_distance=Config.DIAGNOSIS_CACHE_MAX_DISTANCE,
+        max_color_distance=Config.DIAGNOSIS_CACHE_MAX_COLOR_DISTANCE,
+        ttl=Config.DIAGNOSIS_CACHE_TTL,
+        max_entries=Config.DIAGNOSIS_CACHE_MAX_ENTRIES
+    )
@@ -0,0 +1,138 @@
+"""Optional on-CPU plant-disease classifier used as a first-stage triage.
+
+Runs a small ONNX image classifier (e.g. a MobileNet/EfficientNet trained on
+the 38 PlantVillage classes, optionally int8-quantized) with onnxruntime on
+the CPU. Confident predictions are answered locally in tens of
+milliseconds; the rest escalate to the Groq vision model.
+
+Enabled by pointing ``DISEASE_CLASSIFIER_MODEL`` at the ``.onnx`` file
+(needs the ``onnxruntime`` package). The model is expected to take one
+NCHW float32 RGB image normalized with the ImageNet mean/std and return
+logits or probabilities in the order of ``DISEASE_CLASSIFIER_LABELS`` (one
+label per line) or, by default, the PlantVillage folder order below.
+"""
+import threading
+import time
+
+from PIL import Image, ImageOps
+
+from app.config import Config
+from app.services.lazy import lazy_resource
+
+PLANTVILLAGE_LABELS = (
+    "Apple___Apple_scab", "Apple___Black_rot", "Apple___Cedar_apple_rust", "Apple___healthy",
+    "Blueberry___healthy", "Cherry_(including_sour)___Powdery_mildew", "Cherry_(including_sour)___healthy",
+    "Corn_(maize)___Cercospora_leaf_spot Gray_leaf_spot", "Corn_(maize)___Common_rust_",
+    "Corn_(maize)___Northern_Leaf_Blight", "Corn_(maize)___healthy", "Grape___Black_rot",
+    "Grape___Esca_(Black_Measles)", "Grape___Leaf_blight_(Isariopsis_Leaf_Spot)", "Grape___healthy",
+    "Orange___Haunglongbing_(Citrus_greening)", "Peach___Bacterial_spot", "Peach___healthy",
+    "Pepper,_bell___Bacterial_spot", "Pepper,_bell___healthy", "Potato___Early_blight",
+    "Potato___Late_blight", "Potato___healthy", "Raspberry___healthy", "Soybean___healthy",
+    "Squash___Powdery_mildew", "Strawberry___Leaf_scorch", "Strawberry___healthy",
+    "Tomato___Bacterial_spot", "Tomato___Early_blight", "Tomato___Late_blight", "Tomato___Leaf_Mold",
+    "Tomato___Septoria_leaf_spot", "Tomato___Spider_mites Two-spotted_spider_mite", "Tomato___Target_Spot",
+    "Tomato___Tomato_Yellow_Leaf_Curl_Virus", "Tomato___Tomato_mosaic_virus", "Tomato___healthy",
+)
+
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+
+def describe(label):
+    """``"Tomato___Late_blight"`` -> ``("Tomato", "Late blight", False)``."""
+    crop, _, condition = label.partition("___")
+    crop = crop.replace("_", " ").replace(" ,", ",").strip()
+    condition = " ".join(condition.replace("_", " ").split())
+    return crop, condition, condition.lower() == "healthy"
+
+
+def render_markdown(label, confidence):
+    crop, condition, healthy = describe(label)
+    finding = f"**{crop}: no disease detected**" if healthy else f"**Likely issue: {condition} on {crop}**"
+    return (
+        f"{finding} (confidence {confidence:.0%})\n\n"
+        "This is a quick on-device identification. Send the photo again with `detail=true` "
+        "for symptoms, treatment and precautions from the expert model."
+    )
+
+
+class DiseaseClassifier:
+    def __init__(self, model_path, labels, input_size=224, threads=1):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.labels = labels
+        self.input_size = input_size
+        self._lock = threading.Lock()
+        self.stats = {"local": 0, "escalated": 0, "total_ms": 0.0}
+
+    def _tensor(self, image):
+        import numpy as np
+
+        size = self.input_size
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        # Center-crop to a square and resize to the model's input size
+        image = ImageOps.fit(image, (size, size), Image.Resampling.BILINEAR, centering=(0.5, 0.5))
+        pixels = np.asarray(image, dtype=np.float32) / 255.0
+        pixels = (pixels - np.asarray(IMAGENET_MEAN, dtype=np.float32)) / np.asarray(IMAGENET_STD, dtype=np.float32)
+        return pixels.transpose(2, 0, 1)[None]
+
+    def predict(self, stream):
+        """Return ``(label, confidence, elapsed_ms)`` for an image file object."""
+        import numpy as np
+
+        start = time.perf_counter()
+        position = stream.tell()
+        try:
+            with Image.open(stream) as image:
+                image.draft("RGB", (self.input_size * 2, self.input_size * 2))
+                tensor = self._tensor(image)
+        finally:
+            stream.seek(position)
+        scores = self.session.run(None, {self.input_name: tensor})[0][0].astype(np.float64)
+        if scores.min() < 0 or abs(scores.sum() - 1.0) > 1e-3:
+            scores = np.exp(scores - scores.max())
+            scores /= scores.sum()
+        best = int(np.argmax(scores))
+        return self.labels[best], float(scores[best]), (time.perf_counter() - start) * 1000
+
+    def record(self, local, elapsed_ms):
+        with self._lock:
+            self.stats["local" if local else "escalated"] += 1
+            self.stats["total_ms"] += elapsed_ms
+
+    def info(self):
+        with self._lock:
+            calls = self.stats["local"] + self.stats["escalated"]
+            return {
+                "local": self.stats["local"],
+                "escalated": self.stats["escalated"],
+                "local_rate": round(self.stats["local"] / calls, 3) if calls else None,
+                "mean_ms": round(self.stats["total_ms"] / calls, 1) if calls else None,
+                "threshold": Config.DISEASE_CLASSIFIER_THRESHOLD
+            }
+
+
+def load_labels(path):
+    if not path:
+        return PLANTVILLAGE_LABELS
+    with open(path, encoding="utf-8") as f:
+        return tuple(line.strip() for line in f if line.strip())
+
+
+@lazy_resource("disease_classifier", enabled=lambda: bool(Config.DISEASE_CLASSIFIER_MODEL))
+def get_disease_classifier():
+    start = time.perf_counter()
+    classifier = DiseaseClassifier(
+        Config.DISEASE_CLASSIFIER_MODEL,
+        load_labels(Config.DISEASE_CLASSIFIER_LABELS),
+        input_size=Config.DISEASE_CLASSIFIER_INPUT_SIZE,
+        threads=Config.DISEASE_CLASSIFIER_THREADS
+    )
+    print(f"[CLASSIFIER] {Config.DISEASE_CLASSIFIER_MODEL}: {len(classifier.labels)} classes "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+    return classifier
@@ -0,0 +1,106 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from app.config import Config
+from app.services.lazy import lazy_resource
+
+
+class DocumentCache:
+    """SQLite store of PDF page text and translations, keyed by content hash.
+
+    Page text is keyed by the SHA-256 of the PDF bytes, translations by
+    ``(sha256, target_language)``, so a re-uploaded circular skips both
+    parsing and the LLM. Entries are evicted least-recently-used once their
+    total size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, path, max_bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " key TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS documents_accessed ON documents (accessed_at)")
+        self._db.commit()
+        self.stats = {"text_hits": 0, "text_misses": 0, "translation_hits": 0, "translation_misses": 0, "evictions": 0}
+
+    @staticmethod
+    def _translation_key(sha256, target_language):
+        return f"{sha256}:{target_language.strip().lower()}"
+
+    def _get(self, key, kind):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM documents WHERE key = ?", (key,)).fetchone()
+            self.stats[f"{kind}_hits" if row else f"{kind}_misses"] += 1
+            if row is None:
+                return None
+            self._db.execute("UPDATE documents SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return json.loads(row[0])
+
+    def _set(self, key, kind, value):
+        encoded = json.dumps(value, ensure_ascii=False)
+        size = len(encoded.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO documents (key, kind, value, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, encoded, size, time.time())
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM documents ORDER BY accessed_at").fetchall():
+            self._db.execute("DELETE FROM documents WHERE key = ?", (key,))
+            self.stats["evictions"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def get_pages(self, sha256):
+        """Page texts of the PDF with this hash, or ``None``."""
+        return self._get(sha256, "text")
+
+    def set_pages(self, sha256, pages):
+        self._set(sha256, "text", pages)
+
+    def get_translation(self, sha256, target_language):
+        return self._get(self._translation_key(sha256, target_language), "translation")
+
+    def set_translation(self, sha256, target_language, text):
+        self._set(self._translation_key(sha256, target_language), "translation", text)
+
+    def info(self):
+        with self._lock:
+            rows = dict(self._db.execute("SELECT kind, COUNT(*) FROM documents GROUP BY kind").fetchall())
+            size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+        return {
+            **self.stats,
+            "documents": rows.get("text", 0),
+            "translations": rows.get("translation", 0),
+            "size_mb": round(size / (1024 * 1024), 2),
+            "max_mb": round(self.max_bytes / (1024 * 1024), 2)
+        }
+
+
+@lazy_resource("document_cache")
+def get_document_cache():
+    return DocumentCache(
+        os.path.join(Config.CACHE_DIR, "documents.sqlite3"),
+        max_bytes=Config.DOCUMENT_CACHE_MAX_MB * 1024 * 1024
+    )
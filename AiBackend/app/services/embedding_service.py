@@ -0,0 +1,238 @@
+"""Shared query-embedding service over a Unix socket.
+
+One ``embedding_server.py`` process loads MiniLM once; every app worker
+talks to it through ``RemoteEmbeddings`` instead of holding its own copy.
+Requests arriving within ``EMBED_BATCH_WINDOW_MS`` of each other are
+embedded as one batch, and an LRU cache of ``EMBED_CACHE_SIZE`` query
+vectors sits in front of the model.
+
+Wire format: every message is a 4-byte big-endian length plus payload.
+The client sends a JSON list of texts (or ``{"stats": true}``); the server
+answers with a JSON header ``{"shape": [n, dim]}`` followed by the n×dim
+float32 matrix, or a single ``{"error": ...}`` / stats frame.
+"""
+import json
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from langchain_core.embeddings import Embeddings
+
+_LENGTH = struct.Struct(">I")
+
+
+class EmbeddingServiceError(RuntimeError):
+    pass
+
+
+def send_frame(sock, payload):
+    sock.sendall(_LENGTH.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock, size):
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionError("embedding service connection closed")
+        buf += chunk
+    return bytes(buf)
+
+
+def recv_frame(sock):
+    (size,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    return _recv_exact(sock, size)
+
+
+# ─── Server side ───
+
+class LRUCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class MicroBatcher:
+    """Collects texts from concurrent requests and embeds them in batches."""
+
+    def __init__(self, model, window_ms=3, max_batch=64, cache_size=10000):
+        self.model = model
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.cache = LRUCache(cache_size)
+        self.stats = {"requests": 0, "texts": 0, "cache_hits": 0, "batches": 0, "embedded": 0}
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, name="embed-batcher", daemon=True).start()
+
+    def submit(self, texts):
+        """Return a Future resolving to one vector (list of floats) per text."""
+        future = Future()
+        self._queue.put((texts, future))
+        return future
+
+    def _collect(self):
+        pending = [self._queue.get()]
+        count = len(pending[0][0])
+        deadline = time.monotonic() + self.window
+        while count < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            pending.append(item)
+            count += len(item[0])
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            vectors = {}
+            misses = []
+            for texts, _ in pending:
+                for text in texts:
+                    if text in vectors:
+                        continue
+                    cached = self.cache.get(text)
+                    if cached is not None:
+                        vectors[text] = cached
+                        self.stats["cache_hits"] += 1
+                    else:
+                        vectors[text] = None
+                        misses.append(text)
+            try:
+                if misses:
+                    for text, vector in zip(misses, self.model.embed_documents(misses)):
+                        vectors[text] = vector
+                        self.cache.set(text, vector)
+                    self.stats["batches"] += 1
+                    self.stats["embedded"] += len(misses)
+            except Exception as e:
+                print(f"[ERROR] Embedding batch of {len(misses)} failed: {e}")
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+            for texts, future in pending:
+                self.stats["requests"] += 1
+                self.stats["texts"] += len(texts)
+                future.set_result([vectors[text] for text in texts])
+
+
+class EmbeddingRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        import numpy as np
+
+        batcher = self.server.batcher
+        while True:
+            try:
+                request = json.loads(recv_frame(self.request))
+            except ConnectionError:
+                return
+            try:
+                if isinstance(request, dict) and request.get("stats"):
+                    send_frame(self.request, json.dumps(
+                        {**batcher.stats, "cache_entries": len(batcher.cache)}
+                    ).encode("utf-8"))
+                    continue
+                matrix = np.asarray(batcher.submit(request).result(), dtype="<f4")
+                send_frame(self.request, json.dumps({"shape": list(matrix.shape)}).encode("utf-8"))
+                send_frame(self.request, matrix.tobytes())
+            except Exception as e:
+                send_frame(self.request, json.dumps({"error": str(e)}).encode("utf-8"))
+
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Every app worker thread holds its own connection
+    request_queue_size = 1024
+
+    def __init__(self, path, batcher):
+        self.batcher = batcher
+        super().__init__(path, EmbeddingRequestHandler)
+
+
+# ─── Client side ───
+
+class RemoteEmbeddings(Embeddings):
+    """LangChain ``Embeddings`` backed by the embedding service.
+
+    Each thread keeps one persistent connection; a broken connection is
+    reopened once before the error is raised.
+    """
+
+    def __init__(self, path, timeout=10):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def _request(self, payload):
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                send_frame(sock, json.dumps(payload).encode("utf-8"))
+                header = json.loads(recv_frame(sock))
+                if "shape" not in header:
+                    if "error" in header:
+                        raise EmbeddingServiceError(header["error"])
+                    return header, None
+                return header, recv_frame(sock)
+            except (OSError, ConnectionError) as e:
+                self._close()
+                if attempt:
+                    raise EmbeddingServiceError(f"Embedding service at {self.path} unavailable: {e}") from e
+
+    def embed_documents(self, texts):
+        import numpy as np
+
+        if not texts:
+            return []
+        header, body = self._request(list(texts))
+        return np.frombuffer(body, dtype="<f4").reshape(header["shape"]).tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    def stats(self):
+        return self._request({"stats": True})[0]
@@ -0,0 +1,26 @@
+import os
+
+from app.config import Config
+from app.services.lazy import lazy_resource
+
+
+def load_local_model():
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(model_name=Config.EMBED_MODEL)
+
+
+@lazy_resource("embeddings")
+def get_embeddings():
+    """The shared MiniLM sentence-embedding model.
+
+    With ``EMBED_SERVICE_SOCKET`` set, queries go to the embedding service
+    (one model for all workers, micro-batched and cached); otherwise, or if
+    the socket is missing at startup, the model is loaded in this process.
+    """
+    path = Config.EMBED_SERVICE_SOCKET
+    if path:
+        if os.path.exists(path):
+            from app.services.embedding_service import RemoteEmbeddings
+            return RemoteEmbeddings(path)
+        print(f"[ERROR] Embedding service socket {path} not found; loading {Config.EMBED_MODEL} in-process")
+    return load_local_model()
@@ -0,0 +1,126 @@
+"""FAISS retriever backend: an on-disk index plus a memory-mapped docstore.
+
+Layout of the index directory::
+
+    index.faiss   FAISS index over L2-normalized embeddings (inner product)
+    docs.jsonl    one {"id", "text", "metadata"} object per vector
+    offsets.npy   byte offset of each docs.jsonl line
+
+Both the vectors and the docstore are memory-mapped read-only: the index
+is opened with ``IO_FLAG_MMAP_IFC`` (flat, SQ and PQ codes are mapped in
+place; plain ``IO_FLAG_MMAP`` only covers IVF inverted lists) and
+docs.jsonl through ``mmap``, so worker processes share the pages through
+the OS page cache instead of each holding their own copy. FAISS builds
+without ``IO_FLAG_MMAP_IFC`` fall back to ``IO_FLAG_MMAP``.
+"""
+import json
+import mmap
+import os
+
+from app.config import Config
+from app.services.lazy import lazy_resource
+
+QUANTIZATIONS = ("none", "int8", "pq")
+
+
+def build_index(embeddings, quantize="none", pq_subquantizers=48):
+    """Build a FAISS index over ``embeddings`` (an N×d float32 array, normalized)."""
+    import faiss
+
+    dim = embeddings.shape[1]
+    if quantize == "none":
+        index = faiss.IndexFlatIP(dim)
+    elif quantize == "int8":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+    elif quantize == "pq":
+        if len(embeddings) < 256:
+            raise ValueError("PQ needs at least 256 vectors to train its codebooks; use int8 instead")
+        index = faiss.IndexPQ(dim, pq_subquantizers, 8, faiss.METRIC_INNER_PRODUCT)
+    else:
+        raise ValueError(f"Unknown quantization '{quantize}' (expected one of {QUANTIZATIONS})")
+    if not index.is_trained:
+        index.train(embeddings)
+    index.add(embeddings)
+    return index
+
+
+def write_index(directory, ids, texts, metadatas, embeddings, quantize="none"):
+    """Write index.faiss, docs.jsonl and offsets.npy into ``directory``."""
+    import faiss
+    import numpy as np
+
+    os.makedirs(directory, exist_ok=True)
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    faiss.write_index(build_index(embeddings, quantize), os.path.join(directory, "index.faiss"))
+
+    offsets = []
+    with open(os.path.join(directory, "docs.jsonl"), "wb") as f:
+        for doc_id, text, metadata in zip(ids, texts, metadatas):
+            offsets.append(f.tell())
+            line = json.dumps({"id": doc_id, "text": text, "metadata": metadata or {}}, ensure_ascii=False)
+            f.write(line.encode("utf-8") + b"\n")
+    np.save(os.path.join(directory, "offsets.npy"), np.asarray(offsets, dtype=np.int64))
+
+
+class FaissIndex:
+    """Read-only FAISS index + docstore; ``search`` mirrors Chroma's by-vector search."""
+
+    def __init__(self, directory):
+        import faiss
+        import numpy as np
+
+        index_path = os.path.join(directory, "index.faiss")
+        self.index = None
+        # IO_FLAG_MMAP_IFC maps flat/SQ/PQ codes in place (FAISS >= 1.8);
+        # IO_FLAG_MMAP alone only maps IVF inverted lists
+        for flags in (getattr(faiss, "IO_FLAG_MMAP_IFC", None), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY):
+            if flags is None:
+                continue
+            try:
+                self.index = faiss.read_index(index_path, flags)
+                break
+            except RuntimeError:
+                continue
+        if self.index is None:
+            # Index types without mmap support are loaded into memory instead
+            self.index = faiss.read_index(index_path)
+        self.offsets = np.load(os.path.join(directory, "offsets.npy"), mmap_mode="r")
+        self._docs_file = open(os.path.join(directory, "docs.jsonl"), "rb")
+        self._docs = mmap.mmap(self._docs_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.index.ntotal
+
+    def _doc(self, position):
+        start = int(self.offsets[position])
+        end = self._docs.find(b"\n", start)
+        return json.loads(self._docs[start:end])
+
+    def search(self, vector, k):
+        """Return ``[(doc_dict, score), ...]`` best first for one query vector."""
+        import numpy as np
+
+        query = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        query /= np.linalg.norm(query) or 1.0
+        scores, positions = self.index.search(query, k)
+        return [
+            (self._doc(position), float(score))
+            for score, position in zip(scores[0], positions[0])
+            if position >= 0
+        ]
+
+    def similarity_search_by_vector(self, vector, k=4):
+        from langchain_core.documents import Document
+
+        return [
+            Document(page_content=doc["text"], metadata=doc["metadata"])
+            for doc, _ in self.search(vector, k)
+        ]
+
+
+@lazy_resource("faiss_index", enabled=lambda: Config.RETRIEVER_BACKEND == "faiss")
+def get_faiss_index():
+    index = FaissIndex(Config.FAISS_INDEX_DIR)
+    print(f"[VECTORSTORE] FAISS index {Config.FAISS_INDEX_DIR}: {len(index)} vectors")
+    return index
@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from app.config import Config
+from app.services.lazy import lazy_resource
+
+
+@lazy_resource("fanout.executor")
+def get_executor():
+    """Process-wide thread pool for independent upstream fetches."""
+    return ThreadPoolExecutor(
+        max_workers=Config.FANOUT_WORKERS,
+        thread_name_prefix="fanout"
+    )
+
+
+def fan_out(calls, timeout=None):
+    """Run independent calls concurrently under one deadline.
+
+    ``calls`` maps a name to ``(fn, args, default)``. Returns ``{name: result}``
+    where a call that raised or missed the deadline yields its ``default``,
+    so the whole fan-out costs at most ``timeout`` seconds.
+
+    Don't call ``fan_out`` from inside a fanned-out function: nested waits on
+    the same pool can starve it.
+    """
+    timeout = Config.UPSTREAM_TIMEOUT if timeout is None else timeout
+    executor = get_executor()
+    futures = {name: executor.submit(fn, *args) for name, (fn, args, _) in calls.items()}
+    wait(futures.values(), timeout=timeout)
+
+    results = {}
+    for name, future in futures.items():
+        default = calls[name][2]
+        if not future.done():
+            future.cancel()
+            print(f"[ERROR] {name} fetch missed the {timeout}s deadline, using defaults")
+            results[name] = default
+        elif future.exception() is not None:
+            print(f"[ERROR] {name} fetch failed: {future.exception()}")
+            results[name] = default
+        else:
+            results[name] = future.result()
+    return results
@@ -0,0 +1,152 @@
+"""Hybrid BM25 + vector retrieval for the advisory RAG tool.
+
+Vector search misses exact tokens (scheme names, chemical names, variety
+codes like "HD-2967"), BM25 misses paraphrases. Both produce a candidate
+pool of ``RETRIEVER_CANDIDATES`` chunks, fused with reciprocal rank fusion
+(score = Σ 1 / (RETRIEVER_RRF_K + rank)). If ``RERANKER_MODEL`` is set, a
+small CPU cross-encoder then re-scores the fused pool before the top k are
+returned.
+
+The BM25 index is an in-memory inverted index over the same chunks the
+vector backend serves, built once per process on first use.
+"""
+import re
+import time
+from collections import Counter, defaultdict
+
+from app.config import Config
+from app.services.lazy import lazy_resource
+from app.services.timings import stage
+
+# Compound tokens ("hd-2967", "19:19:19", "2,4-d") are indexed whole and as parts
+TOKEN_RE = re.compile(r"\w+(?:[-./:,]\w+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or that the this to was what when "
+    "which with do does can i my me we our you your".split()
+)
+
+
+def tokenize(text):
+    tokens = []
+    for match in TOKEN_RE.finditer(text.lower()):
+        token = match.group()
+        if token not in STOPWORDS:
+            tokens.append(token)
+        if not token.isalnum():
+            tokens.extend(part for part in re.split(r"[-./:,]", token) if part and part not in STOPWORDS)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents.
+
+    Postings store the precomputed per-(term, doc) weight, so a query is
+    just a sum over the postings of its terms.
+    """
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        import numpy as np
+
+        self.documents = documents
+        tokenized = [tokenize(doc.page_content) for doc in documents]
+        lengths = np.asarray([len(tokens) for tokens in tokenized], dtype=np.float32)
+        avg_length = float(lengths.mean()) if len(lengths) else 0.0
+
+        postings = defaultdict(list)
+        for position, tokens in enumerate(tokenized):
+            for term, tf in Counter(tokens).items():
+                postings[term].append((position, tf))
+
+        count = len(documents)
+        self.postings = {}
+        for term, entries in postings.items():
+            positions = np.asarray([position for position, _ in entries], dtype=np.int32)
+            tf = np.asarray([tf for _, tf in entries], dtype=np.float32)
+            idf = np.log(1 + (count - len(entries) + 0.5) / (len(entries) + 0.5))
+            norm = k1 * (1 - b + b * lengths[positions] / (avg_length or 1.0))
+            self.postings[term] = (positions, (idf * tf * (k1 + 1) / (tf + norm)).astype(np.float32))
+
+    def __len__(self):
+        return len(self.documents)
+
+    def search(self, query, k):
+        """Return ``[(document, score), ...]`` best first; documents with no matching term are left out."""
+        import numpy as np
+
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        for term in set(tokenize(query)):
+            if term in self.postings:
+                positions, weights = self.postings[term]
+                scores[positions] += weights
+        matched = np.flatnonzero(scores)
+        if not len(matched):
+            return []
+        top = matched[np.argsort(-scores[matched], kind="stable")[:k]]
+        return [(self.documents[position], float(scores[position])) for position in top]
+
+
+def load_corpus():
+    """All chunks served by the configured vector backend, as LangChain Documents."""
+    from langchain_core.documents import Document
+
+    if Config.RETRIEVER_BACKEND == "faiss":
+        from app.services.faiss_index import get_faiss_index
+        index = get_faiss_index()
+        docs = (index._doc(position) for position in range(len(index)))
+        return [Document(page_content=doc["text"], metadata=doc["metadata"]) for doc in docs]
+
+    from app.services.vectorstore import get_vectorstore
+    data = get_vectorstore()._collection.get(include=["documents", "metadatas"])
+    return [
+        Document(page_content=text, metadata=metadata or {})
+        for text, metadata in zip(data["documents"], data["metadatas"])
+    ]
+
+
+@lazy_resource("bm25_index", enabled=lambda: Config.RETRIEVER_MODE == "hybrid")
+def get_bm25_index():
+    start = time.perf_counter()
+    index = BM25Index(load_corpus())
+    print(f"[RETRIEVER] BM25 index over {len(index)} chunks, {len(index.postings)} terms "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+    return index
+
+
+@lazy_resource("reranker", enabled=lambda: bool(Config.RERANKER_MODEL))
+def get_reranker():
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(Config.RERANKER_MODEL, device="cpu")
+
+
+def reciprocal_rank_fusion(*rankings, rrf_k=60):
+    """Fuse ranked Document lists; chunks are identified by their text."""
+    scores = defaultdict(float)
+    docs = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            scores[doc.page_content] += 1.0 / (rrf_k + rank)
+            docs.setdefault(doc.page_content, doc)
+    return [docs[key] for key in sorted(scores, key=scores.get, reverse=True)]
+
+
+def rerank(query, docs, k):
+    scores = get_reranker().predict([(query, doc.page_content) for doc in docs])
+    ranked = sorted(zip(docs, scores), key=lambda pair: float(pair[1]), reverse=True)
+    return [doc for doc, _ in ranked[:k]]
+
+
+def hybrid_search(query, vector, backend, k, candidates=None, use_reranker=None):
+    """Top ``k`` chunks for ``query`` from BM25 and vector candidates, fused and optionally reranked."""
+    candidates = max(k, candidates or Config.RETRIEVER_CANDIDATES)
+    if use_reranker is None:
+        use_reranker = bool(Config.RERANKER_MODEL)
+
+    with stage("search"):
+        dense = backend.similarity_search_by_vector(vector, k=candidates)
+    with stage("bm25"):
+        sparse = [doc for doc, _ in get_bm25_index().search(query, candidates)]
+    fused = reciprocal_rank_fusion(dense, sparse, rrf_k=Config.RETRIEVER_RRF_K)[:candidates]
+    if not use_reranker:
+        return fused[:k]
+    with stage("rerank"):
+        return rerank(query, fused, k)
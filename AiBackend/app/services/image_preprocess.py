@@ -0,0 +1,157 @@
+"""Shrink phone photos before they are sent to the vision model.
+
+Detects the real format, applies the EXIF orientation, downsizes to
+``IMAGE_MAX_SIDE`` (the vision model tiles images at well under phone
+resolution, so extra pixels only cost upload time), drops all metadata
+(EXIF/GPS, ICC, XMP) and re-encodes to ``IMAGE_FORMAT`` at
+``IMAGE_QUALITY``.
+"""
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+from app.config import Config
+
+FORMATS = {"jpeg": ("JPEG", "image/jpeg"), "webp": ("WEBP", "image/webp")}
+
+
+def phash(image, hash_size=8, highfreq_factor=4):
+    """64-bit perceptual hash (DCT of a 32×32 grayscale thumbnail).
+
+    Near-identical photos (re-encoded, resized, slightly re-framed) differ
+    in only a few bits.
+    """
+    import numpy as np
+
+    size = hash_size * highfreq_factor
+    pixels = np.asarray(image.convert("L").resize((size, size), Image.Resampling.LANCZOS), dtype=np.float64)
+    n = np.arange(size)
+    dct = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+    low = (dct @ pixels @ dct.T)[:hash_size, :hash_size]
+    bits = (low > np.median(low)).flatten()
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def color_signature(image, bins=18):
+    """Coarse hue histogram as ``bins + 1`` bytes summing to about 255.
+
+    pHash works on grayscale, so it cannot tell a green leaf from the same
+    leaf turned yellow or brown; this records where the colour mass sits.
+    Each pixel's weight is split between the two nearest of ``bins`` hue
+    centres, so a small white-balance shift moves little mass. Dull or
+    dark pixels (soil, shadow, white background) count towards the last
+    bin instead, with a soft ramp for the same reason.
+    """
+    import numpy as np
+
+    hsv = np.asarray(image.convert("RGB").resize((64, 64), Image.Resampling.BILINEAR).convert("HSV"))
+    hue, saturation, value = (hsv[..., channel].ravel() / 255.0 for channel in range(3))
+    colored = np.clip((saturation - 0.1) / 0.3, 0, 1) * np.clip((value - 0.1) / 0.15, 0, 1)
+    position = hue * bins
+    lower = np.floor(position).astype(int)
+    upper_share = position - lower
+    counts = (
+        np.bincount(lower % bins, weights=colored * (1 - upper_share), minlength=bins)
+        + np.bincount((lower + 1) % bins, weights=colored * upper_share, minlength=bins)
+    )
+    counts = np.append(counts, np.sum(1 - colored))
+    return np.rint(counts / counts.sum() * 255).astype(np.uint8).tobytes()
+
+
+def color_distance(a, b):
+    """Share of the image (0–1) whose colour differs between two signatures.
+
+    Both hue histograms are blurred over ±2 bins (±40°) first, so the cost
+    grows with how far the hue moved: a white-balance shift of a few
+    degrees costs little, green turning yellow costs nearly all of it.
+    ``b`` may also be an n×(bins + 1) array, giving one distance per row.
+    """
+    import numpy as np
+
+    a, b = (
+        np.frombuffer(sig, dtype=np.uint8) if isinstance(sig, bytes) else np.asarray(sig)
+        for sig in (a, b)
+    )
+    return np.abs(_blur_hues(a) - _blur_hues(b)).sum(axis=-1) / 2 / 255
+
+
+def _blur_hues(signature):
+    import numpy as np
+
+    hues = signature[..., :-1].astype(np.float64)
+    blurred = sum(
+        weight * np.roll(hues, shift, axis=-1)
+        for shift, weight in ((-2, 1), (-1, 2), (0, 3), (1, 2), (2, 1))
+    ) / 9
+    return np.concatenate([blurred, signature[..., -1:].astype(np.float64)], axis=-1)
+
+
+def fingerprint(image):
+    """``(phash, color_signature)`` of a decoded image."""
+    return phash(image), color_signature(image)
+
+
+def image_fingerprint(stream):
+    """``fingerprint`` of an uploaded image file (decoded at reduced size)."""
+    position = stream.tell()
+    try:
+        with Image.open(stream) as image:
+            image.draft("RGB", (256, 256))
+            return fingerprint(ImageOps.exif_transpose(image))
+    finally:
+        stream.seek(position)
+
+
+def detect_mimetype(stream):
+    """Mimetype from the file's own header (not the client's label), or ``None``."""
+    position = stream.tell()
+    try:
+        with Image.open(stream) as image:
+            return Image.MIME.get(image.format)
+    except Exception:
+        return None
+    finally:
+        stream.seek(position)
+
+
+def preprocess_image(stream, max_side=None, output_format=None, quality=None):
+    """Return ``(image_bytes, mimetype, info)`` for the re-encoded image.
+
+    ``info`` includes the ``phash`` and ``color`` signature of the
+    processed image.
+
+    Raises ``PIL.UnidentifiedImageError`` (an ``OSError``) for files that
+    are not images.
+    """
+    max_side = max_side or Config.IMAGE_MAX_SIDE
+    pil_format, mimetype = FORMATS[(output_format or Config.IMAGE_FORMAT).lower()]
+    quality = quality or Config.IMAGE_QUALITY
+
+    stream.seek(0)
+    with Image.open(stream) as image:
+        source_format = image.format
+        source_size = image.size
+        # JPEG: let the decoder downscale by a power of two while decoding
+        image.draft("RGB", (max_side, max_side))
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+        out = BytesIO()
+        # No exif/icc_profile arguments: metadata is not carried over
+        image.save(out, pil_format, quality=quality, optimize=True)
+
+    data = out.getvalue()
+    return data, mimetype, {
+        "source_format": source_format,
+        "source_size": source_size,
+        "size": image.size,
+        "bytes": len(data),
+        "phash": phash(image),
+        "color": color_signature(image)
+    }
@@ -0,0 +1,51 @@
+import threading
+import time
+
+_registry = {}
+
+
+def lazy_resource(name, enabled=None):
+    """Turn a zero-argument factory into a thread-safe, build-once getter.
+
+    The resource is created on the first call (or by ``warm_up``) and shared
+    for the rest of the process lifetime. ``enabled`` is an optional
+    zero-argument predicate; ``warm_up`` skips the resource while it is false
+    (e.g. a backend that is not configured).
+    """
+    def decorator(factory):
+        lock = threading.Lock()
+        state = {}
+
+        def getter():
+            if "value" not in state:
+                with lock:
+                    if "value" not in state:
+                        state["value"] = factory()
+            return state["value"]
+
+        getter.__name__ = factory.__name__
+        getter.__doc__ = factory.__doc__
+        getter.is_loaded = lambda: "value" in state
+        getter.is_enabled = enabled or (lambda: True)
+        _registry[name] = getter
+        return getter
+
+    return decorator
+
+
+def warm_up(names=None):
+    """Build the registered resources now and return ``{name: seconds}``."""
+    timings = {}
+    for name, getter in list(_registry.items()):
+        if names and name not in names:
+            continue
+        if not getter.is_enabled():
+            continue
+        start = time.perf_counter()
+        getter()
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def loaded_resources():
+    return {name: getter.is_loaded() for name, getter in _registry.items()}
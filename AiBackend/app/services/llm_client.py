@@ -0,0 +1,112 @@
+import json
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import Config
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide ``requests.Session`` with keep-alive pooling and retries.
+
+    Retries (with exponential backoff, honouring ``Retry-After``) cover
+    connection errors and 429/5xx answers for both GET and POST.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=Config.HTTP_MAX_RETRIES,
+                    backoff_factor=Config.HTTP_BACKOFF_FACTOR,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=frozenset(["GET", "POST"]),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=Config.HTTP_POOL_SIZE,
+                    pool_maxsize=Config.HTTP_POOL_SIZE,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def default_timeout():
+    return (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT)
+
+
+def groq_headers():
+    return {
+        "Authorization": f"Bearer {Config.GROQ_API_KEY}",
+        "Content-Type": "application/json"
+    }
+
+
+def post_chat(payload, timeout=None, **kwargs):
+    """POST a chat-completions payload to Groq and return the raw response."""
+    return get_session().post(
+        Config.GROQ_API_URL,
+        headers=groq_headers(),
+        json=payload,
+        timeout=timeout or default_timeout(),
+        **kwargs
+    )
+
+
+def post_chat_body(body, timeout=None):
+    """POST an already-serialized JSON payload (bytes or a file object).
+
+    File bodies are streamed from disk instead of being built in memory.
+    """
+    return get_session().post(
+        Config.GROQ_API_URL,
+        headers=groq_headers(),
+        data=body,
+        timeout=timeout or default_timeout()
+    )
+
+
+def chat_completion(messages, model, temperature=0.7, **params):
+    """Run a chat completion and return the assistant message text.
+
+    Raises ``requests.exceptions.RequestException`` on transport errors and
+    non-2xx responses (after retries).
+    """
+    payload = {"model": model, "messages": messages, "temperature": temperature, **params}
+    response = post_chat(payload)
+    response.raise_for_status()
+    return response.json()["choices"][0]["message"]["content"]
+
+
+def stream_chat(payload, timeout=None):
+    """Yield content deltas from a streamed Groq chat completion.
+
+    Groq streams OpenAI-style server-sent events (``data: {...}`` lines,
+    terminated by ``data: [DONE]``).
+    """
+    payload = dict(payload, stream=True)
+    with post_chat(payload, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        response.encoding = "utf-8"
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices") or [{}]
+            delta = choices[0].get("delta", {}).get("content")
+            if delta:
+                yield delta
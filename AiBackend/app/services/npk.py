@@ -0,0 +1,243 @@
+"""Table-driven N–P–K calculator for the fertilizer hot path.
+
+Starts from general Indian package-of-practice doses per crop (kg/ha of N,
+P2O5 and K2O), adjusts them for soil fertility, pH and texture, and turns
+them into straight-fertilizer quantities (DAP, MOP, Urea). Pure Python, no
+I/O — a call takes microseconds.
+"""
+import math
+
+HA_TO_ACRE = 0.4047
+
+# kg/ha of N, P2O5, K2O and the share of N given at each application
+CROP_REQUIREMENTS = {
+    "rice":        {"n": 120, "p": 60,  "k": 40,  "n_split": [("Basal", 0.5), ("Tillering (20–25 DAT)", 0.25), ("Panicle initiation (45–50 DAT)", 0.25)]},
+    "wheat":       {"n": 120, "p": 60,  "k": 40,  "n_split": [("Basal", 0.5), ("First irrigation (CRI, 21 DAS)", 0.25), ("Second irrigation (40–45 DAS)", 0.25)]},
+    "maize":       {"n": 150, "p": 75,  "k": 40,  "n_split": [("Basal", 0.33), ("Knee-high (25–30 DAS)", 0.33), ("Tasselling (45–50 DAS)", 0.34)]},
+    "sorghum":     {"n": 80,  "p": 40,  "k": 40,  "n_split": [("Basal", 0.5), ("30 DAS", 0.5)]},
+    "pearl millet": {"n": 80, "p": 40,  "k": 40,  "n_split": [("Basal", 0.5), ("25–30 DAS", 0.5)]},
+    "cotton":      {"n": 120, "p": 60,  "k": 60,  "n_split": [("Basal", 0.2), ("Square formation (30–35 DAS)", 0.4), ("Flowering (60–65 DAS)", 0.4)]},
+    "sugarcane":   {"n": 250, "p": 115, "k": 115, "n_split": [("Basal", 0.33), ("Tillering (45 DAP)", 0.33), ("Grand growth (90 DAP)", 0.34)]},
+    "soybean":     {"n": 30,  "p": 60,  "k": 40,  "n_split": [("Basal", 1.0)]},
+    "groundnut":   {"n": 25,  "p": 50,  "k": 45,  "n_split": [("Basal", 1.0)]},
+    "chickpea":    {"n": 20,  "p": 40,  "k": 20,  "n_split": [("Basal", 1.0)]},
+    "pigeon pea":  {"n": 25,  "p": 50,  "k": 25,  "n_split": [("Basal", 1.0)]},
+    "mustard":     {"n": 80,  "p": 40,  "k": 40,  "n_split": [("Basal", 0.5), ("First irrigation (25–30 DAS)", 0.5)]},
+    "potato":      {"n": 180, "p": 80,  "k": 100, "n_split": [("Basal", 0.5), ("Earthing up (30 DAP)", 0.5)]},
+    "tomato":      {"n": 120, "p": 80,  "k": 60,  "n_split": [("Basal", 0.33), ("30 DAT", 0.33), ("Flowering (60 DAT)", 0.34)]},
+    "onion":       {"n": 100, "p": 50,  "k": 50,  "n_split": [("Basal", 0.5), ("30 DAT", 0.25), ("45 DAT", 0.25)]},
+}
+DEFAULT_REQUIREMENT = {"n": 100, "p": 50, "k": 40, "n_split": [("Basal", 0.5), ("30 days after sowing", 0.5)]}
+
+CROP_ALIASES = {
+    "paddy": "rice", "dhan": "rice", "gehun": "wheat", "corn": "maize", "makka": "maize",
+    "jowar": "sorghum", "bajra": "pearl millet", "kapas": "cotton", "ganna": "sugarcane",
+    "soya": "soybean", "soyabean": "soybean", "moongphali": "groundnut", "peanut": "groundnut",
+    "gram": "chickpea", "chana": "chickpea", "tur": "pigeon pea", "arhar": "pigeon pea",
+    "pigeonpea": "pigeon pea", "sarson": "mustard", "rapeseed": "mustard", "aloo": "potato",
+    "tamatar": "tomato", "pyaz": "onion",
+}
+
+# Nutrient content of the straight fertilizers used for the plan
+UREA_N = 0.46
+DAP_N, DAP_P = 0.18, 0.46
+MOP_K = 0.60
+
+
+def match_crop(crop):
+    name = str(crop).strip().lower()
+    name = CROP_ALIASES.get(name, name)
+    if name in CROP_REQUIREMENTS:
+        return name, CROP_REQUIREMENTS[name]
+    for known in CROP_REQUIREMENTS:
+        if known in name:
+            return known, CROP_REQUIREMENTS[known]
+    return None, DEFAULT_REQUIREMENT
+
+
+# SoilGrids mapped units -> plain units (pH×10, N cg/kg, SOC dg/kg, clay g/kg)
+MAPPED_UNIT_FACTORS = {
+    "soil_ph": 0.1,
+    "soil_nitrogen": 0.001,
+    "soil_organic_carbon": 0.01,
+    "soil_clay": 0.1,
+}
+PLAIN_SOIL_DEFAULTS = {"soil_ph": 6.5, "soil_nitrogen": 0.1, "soil_organic_carbon": 1.2, "soil_clay": 20.0}
+
+
+def to_plain_units(key, value):
+    """Convert one SoilGrids/OpenEPI mapped value to pH or %."""
+    if value is None:
+        return None
+    return round(float(value) * MAPPED_UNIT_FACTORS[key], 4)
+
+
+def soil_number(value):
+    """``value`` as a positive finite float, or ``None`` (missing, ``"acidic"``, ``"6.5 pH"``...)."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) and number > 0 else None
+
+
+def normalize_soil(soil_data):
+    """Soil values in the units the prompt uses (pH, %, %).
+
+    ``fetch_soil_properties`` already converts OpenEPI/SoilGrids values to
+    plain units. Payloads still in mapped units (older clients, older soil
+    cache rows) are recognized by pH > 14, and then every field is
+    converted; the unit is never guessed per field, since a sandy 8 % clay
+    soil is 80 in g/kg. Missing or non-numeric fields use the defaults.
+    """
+    numbers = {key: soil_number(soil_data.get(key)) for key in PLAIN_SOIL_DEFAULTS}
+    mapped = (numbers["soil_ph"] or 0) > 14
+    values = {}
+    for key, default in PLAIN_SOIL_DEFAULTS.items():
+        value = numbers[key]
+        if value is None:
+            values[key] = default
+        elif mapped:
+            values[key] = to_plain_units(key, value)
+        else:
+            values[key] = value
+    return {
+        "ph": values["soil_ph"],
+        "nitrogen": values["soil_nitrogen"],
+        "organic_carbon": values["soil_organic_carbon"],
+        "clay": values["soil_clay"],
+    }
+
+
+def fertility_class(soil):
+    """Low/medium/high N status from organic carbon, the usual Indian proxy."""
+    if soil["organic_carbon"] < 0.5 or soil["nitrogen"] < 0.05:
+        return "low"
+    if soil["organic_carbon"] > 0.75 and soil["nitrogen"] >= 0.1:
+        return "high"
+    return "medium"
+
+
+def calculate_npk(crop, soil_data, weather_data=None):
+    """Compute the nutrient plan for ``crop`` on the given soil.
+
+    Returns a dict with the matched crop, soil interpretation, nutrient doses
+    (kg/ha), product quantities, amendments and a Markdown summary table in
+    the same layout as the LLM plan.
+    """
+    matched, requirement = match_crop(crop)
+    soil = normalize_soil(soil_data)
+    fertility = fertility_class(soil)
+
+    n_factor = {"low": 1.25, "medium": 1.0, "high": 0.75}[fertility]
+    p_factor = 1.0
+    k_factor = 1.0
+    amendments = []
+    notes = []
+
+    if soil["ph"] < 5.0:
+        p_factor = 1.15
+        amendments.append(("Agricultural lime", "2.5 t/ha", "3–4 weeks before sowing; broadcast and mix", "Raises very acidic soil pH"))
+    elif soil["ph"] < 5.5:
+        p_factor = 1.1
+        amendments.append(("Agricultural lime", "1.5 t/ha", "3–4 weeks before sowing; broadcast and mix", "Corrects acidity, improves P uptake"))
+    elif soil["ph"] > 8.5:
+        p_factor = 1.15
+        amendments.append(("Gypsum", "2.5 t/ha", "Before sowing; broadcast and mix", "Reclaims sodic/alkaline soil"))
+        amendments.append(("Zinc sulphate (21% Zn)", "25 kg/ha", "Basal", "Zn is poorly available at high pH"))
+    elif soil["ph"] > 7.8:
+        amendments.append(("Zinc sulphate (21% Zn)", "25 kg/ha", "Basal", "Zn is poorly available at high pH"))
+
+    sandy = soil["clay"] < 15
+    if sandy:
+        k_factor = 1.1
+        notes.append("Light (sandy) soil: split nitrogen and potash to limit leaching.")
+    if soil["organic_carbon"] < 0.5:
+        amendments.append(("Farmyard manure / compost", "10 t/ha", "2–3 weeks before sowing", "Builds organic carbon"))
+    if weather_data and float(weather_data.get("precipitation") or 0) > 10:
+        notes.append("Heavy rain now: delay top-dressing until the field drains.")
+
+    n = round(requirement["n"] * n_factor)
+    p = round(requirement["p"] * p_factor)
+    k = round(requirement["k"] * k_factor)
+
+    dap = p / DAP_P
+    mop = k / MOP_K
+    urea = max(n - dap * DAP_N, 0) / UREA_N
+
+    products = [
+        {
+            "name": "DAP (18-46-0)",
+            "kg_per_ha": round(dap),
+            "timing": "Basal",
+            "method": "Band placement at sowing",
+            "notes": "Supplies all P and part of N"
+        },
+        {
+            "name": "MOP (0-0-60)",
+            "kg_per_ha": round(mop),
+            "timing": "Basal" if not sandy else "Basal 50%, first top-dress 50%",
+            "method": "Broadcast and incorporate",
+            "notes": "Potash"
+        },
+        {
+            "name": "Urea (46% N)",
+            "kg_per_ha": round(urea),
+            "timing": " + ".join(f"{stage} {round(share * 100)}%" for stage, share in requirement["n_split"]),
+            "method": "Broadcast; top-dress into moist soil",
+            "notes": "Split application reduces volatilization losses"
+        },
+    ]
+    for product in products:
+        product["kg_per_acre"] = round(product["kg_per_ha"] * HA_TO_ACRE)
+
+    plan = {
+        "crop": crop,
+        "matched_crop": matched,
+        "soil": {**{key: round(value, 3) for key, value in soil.items()}, "fertility": fertility},
+        "nutrients_kg_per_ha": {"N": n, "P2O5": p, "K2O": k},
+        "products": products,
+        "amendments": [
+            {"name": name, "rate": rate, "timing": timing, "notes": note}
+            for name, rate, timing, note in amendments
+        ],
+        "notes": notes,
+    }
+    plan["summary_table"] = summary_table(plan)
+    return plan
+
+
+def summary_table(plan):
+    rows = [
+        "| Component | Recommendation | Rate | Timing/Method | Notes |",
+        "|-----------|----------------|------|---------------|-------|",
+    ]
+    for product in plan["products"]:
+        rows.append(
+            f"| {product['name']} | {product['timing']} | "
+            f"{product['kg_per_ha']} kg/ha ({product['kg_per_acre']} kg/acre) | "
+            f"{product['method']} | {product['notes']} |"
+        )
+    for amendment in plan["amendments"]:
+        rows.append(
+            f"| {amendment['name']} | Soil amendment | {amendment['rate']} | "
+            f"{amendment['timing']} | {amendment['notes']} |"
+        )
+    return "\n".join(rows)
+
+
+def render_markdown(plan):
+    """Short farmer-facing text for ``mode=fast`` (no LLM)."""
+    nutrients = plan["nutrients_kg_per_ha"]
+    soil = plan["soil"]
+    crop_note = "" if plan["matched_crop"] else " (general recommendation; crop not in table)"
+    lines = [
+        f"## Fertilizer plan for {plan['crop']}{crop_note}",
+        "",
+        f"- Soil pH {soil['ph']:.1f}, organic carbon {soil['organic_carbon']:.2f}%, "
+        f"fertility: **{soil['fertility']}**",
+        f"- Nutrient dose: **N {nutrients['N']} – P₂O₅ {nutrients['P2O5']} – K₂O {nutrients['K2O']} kg/ha**",
+    ]
+    lines += [f"- {note}" for note in plan["notes"]]
+    lines += ["", plan["summary_table"]]
+    return "\n".join(lines)
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import Config
+from app.services.embeddings import get_embeddings
+
+
+def normalize_text(text):
+    return re.sub(r"\s+", " ", str(text)).strip().strip("?.!").strip().lower()
+
+
+def make_key(params):
+    normalized = {k: normalize_text(v) if isinstance(v, str) else v for k, v in params.items()}
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+
+class ResponseCache:
+    """TTL + LRU cache of endpoint responses with an optional semantic tier.
+
+    Entries are keyed on the normalized request ``params`` plus the free-text
+    ``text`` (the farmer's question). On an exact miss the semantic tier
+    embeds ``text`` and serves the closest entry sharing the same ``params``
+    when cosine similarity is at least ``threshold``.
+    """
+
+    def __init__(self, name, max_entries, ttl, threshold=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self._entries = OrderedDict()  # key -> (expires_at, scope, vector, value)
+        self._vectors = OrderedDict()  # normalized text -> unit vector (small memo)
+        self._lock = threading.Lock()
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, params, text=None):
+        scope = make_key(params)
+        key = make_key({**params, "__text__": text})
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.stats["exact_hits"] += 1
+                return entry[3]
+            if entry:
+                del self._entries[key]
+
+        vector = self._embed(text) if self.threshold is not None and text else None
+        if vector is not None:
+            best_key, best_score = None, self.threshold
+            with self._lock:
+                for candidate_key, (expires_at, candidate_scope, candidate_vector, _) in self._entries.items():
+                    if candidate_scope != scope or candidate_vector is None or expires_at <= now:
+                        continue
+                    score = float(vector @ candidate_vector)
+                    if score >= best_score:
+                        best_key, best_score = candidate_key, score
+                if best_key is not None:
+                    self._entries.move_to_end(best_key)
+                    self.stats["semantic_hits"] += 1
+                    return self._entries[best_key][3]
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, params, value, text=None):
+        scope = make_key(params)
+        key = make_key({**params, "__text__": text})
+        vector = self._embed(text) if self.threshold is not None and text else None
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, scope, vector, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def _embed(self, text):
+        """Unit vector for ``text``, or ``None`` if the embedding model fails.
+
+        The semantic tier is then skipped (a lookup is a miss, an entry is
+        stored for exact hits only) instead of failing the request.
+        """
+        import numpy as np
+
+        normalized = normalize_text(text)
+        with self._lock:
+            vector = self._vectors.get(normalized)
+        if vector is None:
+            try:
+                vector = np.asarray(get_embeddings().embed_query(normalized), dtype=np.float32)
+            except Exception as e:
+                print(f"[ERROR] {self.name} cache embedding failed: {e}")
+                return None
+            vector /= np.linalg.norm(vector) or 1.0
+            with self._lock:
+                self._vectors[normalized] = vector
+                while len(self._vectors) > 256:
+                    self._vectors.popitem(last=False)
+        return vector
+
+    def info(self):
+        with self._lock:
+            lookups = self.stats["exact_hits"] + self.stats["semantic_hits"] + self.stats["misses"]
+            hits = lookups - self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+            }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(endpoint):
+    """The cache for ``endpoint``, or ``None`` unless it opted in via config."""
+    enabled = {e.strip() for e in Config.RESPONSE_CACHE_ENDPOINTS.split(",") if e.strip()}
+    if endpoint not in enabled:
+        return None
+    with _caches_lock:
+        if endpoint not in _caches:
+            _caches[endpoint] = ResponseCache(
+                endpoint,
+                max_entries=Config.RESPONSE_CACHE_MAX_ENTRIES,
+                ttl=Config.RESPONSE_CACHE_TTL,
+                threshold=Config.RESPONSE_CACHE_SEMANTIC_THRESHOLD if Config.RESPONSE_CACHE_SEMANTIC else None
+            )
+        return _caches[endpoint]
+
+
+def cache_stats():
+    with _caches_lock:
+        return {name: cache.info() for name, cache in _caches.items()}
@@ -0,0 +1,86 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from app.config import Config
+from app.services.lazy import lazy_resource
+
+
+def grid_cell(lat, lon, resolution):
+    """Integer (row, col) of the ``resolution``-degree cell holding a point."""
+    # round() first so points on a boundary don't flip cells on float noise
+    return (math.floor(round(float(lat) / resolution, 9)),
+            math.floor(round(float(lon) / resolution, 9)))
+
+
+def cell_center(cell, resolution):
+    row, col = cell
+    return round((row + 0.5) * resolution, 6), round((col + 0.5) * resolution, 6)
+
+
+class SoilCache:
+    """SQLite store of soil properties per lat/lon grid cell.
+
+    Soil properties change on the scale of years, so farms in the same cell
+    share one upstream lookup. Each row also records which fields were
+    filled in from the hard-coded defaults rather than fetched.
+    """
+
+    def __init__(self, path, resolution, ttl):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.resolution = resolution
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS soil ("
+            " cell TEXT PRIMARY KEY,"
+            " soil_data TEXT NOT NULL,"
+            " defaulted TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._db.commit()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _key(self, cell):
+        # "u2": values stored in pH/% (older rows held SoilGrids mapped units)
+        return f"u2:{self.resolution}:{cell[0]}:{cell[1]}"
+
+    def get(self, cell):
+        """Return ``(soil_data, defaulted)`` for a cell, or ``None``."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT soil_data, defaulted FROM soil WHERE cell = ? AND fetched_at > ?",
+                (self._key(cell), time.time() - self.ttl)
+            ).fetchone()
+            self.stats["hits" if row else "misses"] += 1
+        if row is None:
+            return None
+        return json.loads(row[0]), json.loads(row[1])
+
+    def set(self, cell, soil_data, defaulted):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO soil (cell, soil_data, defaulted, fetched_at) VALUES (?, ?, ?, ?)",
+                (self._key(cell), json.dumps(soil_data), json.dumps(defaulted), time.time())
+            )
+            self._db.commit()
+
+    def info(self):
+        with self._lock:
+            cells, defaulted_cells = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(defaulted != '[]'), 0) FROM soil"
+            ).fetchone()
+            return {**self.stats, "cells": cells, "cells_with_defaults": defaulted_cells}
+
+
+@lazy_resource("soil_cache")
+def get_soil_cache():
+    return SoilCache(
+        os.path.join(Config.CACHE_DIR, "soil.sqlite3"),
+        resolution=Config.SOIL_CACHE_CELL_DEG,
+        ttl=Config.SOIL_CACHE_TTL
+    )
@@ -0,0 +1,66 @@
+import json
+import time
+
+import requests
+from flask import Response, request, stream_with_context
+
+
+def wants_stream():
+    """True when the client opted into SSE with ``stream=true``.
+
+    Accepted as a query argument, a JSON body field or a form field.
+    """
+    value = request.args.get("stream")
+    if value is None:
+        body = request.get_json(silent=True) if request.is_json else None
+        value = (body or {}).get("stream", request.form.get("stream"))
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes")
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def stream_completion(chunks, on_complete=None, **metadata):
+    """Relay text chunks as ``token`` events, then one ``done`` event.
+
+    The ``done`` event carries the full text, timing metadata and any extra
+    ``metadata`` fields. ``on_complete(text)`` runs once the text is final.
+    Upstream failures, including malformed chunks (bad JSON, no
+    ``choices[0].delta``), end the stream with an ``error`` event.
+    """
+    start = time.perf_counter()
+    first_token = None
+    parts = []
+    try:
+        for chunk in chunks:
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            parts.append(chunk)
+            yield sse_event("token", {"content": chunk})
+    except (requests.exceptions.RequestException, ValueError, KeyError, IndexError) as e:
+        yield sse_event("error", {"error": str(e)})
+        return
+
+    text = "".join(parts)
+    if on_complete:
+        on_complete(text)
+    total = time.perf_counter() - start
+    yield sse_event("done", {
+        **metadata,
+        "text": text,
+        "timing": {
+            "time_to_first_token_ms": round((first_token or total) * 1000, 1),
+            "total_ms": round(total * 1000, 1)
+        }
+    })
+
+
+def sse_response(events):
+    return Response(
+        stream_with_context(events),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
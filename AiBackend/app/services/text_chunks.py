@@ -0,0 +1,55 @@
+"""Page streaming and token-budgeted chunking for long documents."""
+
+# Rough token estimate: ~4 bytes of UTF-8 per token holds for English and
+# errs on the safe side for Devanagari (3 bytes per character).
+BYTES_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return len(text.encode("utf-8")) // BYTES_PER_TOKEN
+
+
+def iter_pdf_pages(doc):
+    """Yield the text of each page of an open PyMuPDF document, one at a time."""
+    for page in doc:
+        yield page.get_text()
+
+
+def _pieces(line, max_bytes):
+    if len(line.encode("utf-8")) <= max_bytes:
+        return [line]
+    # A single over-long line: hard split (4 bytes is the widest UTF-8 character)
+    step = max(1, max_bytes // 4)
+    return [line[i:i + step] for i in range(0, len(line), step)]
+
+
+def chunk_pages(pages, max_tokens):
+    """Split page texts into chunks of at most ``max_tokens`` (estimated).
+
+    Chunks end at a paragraph break when one falls in the second half of
+    the chunk, otherwise at a line break. Concatenating the chunks gives
+    back the concatenated pages, so a document that fits in one chunk yields
+    exactly ``"".join(pages).strip()``. Empty chunks are dropped.
+    """
+    max_bytes = max_tokens * BYTES_PER_TOKEN
+    chunks = []
+    lines, sizes, size, last_break = [], [], 0, 0
+
+    for page in pages:
+        for line in page.splitlines(keepends=True):
+            for piece in _pieces(line, max_bytes):
+                piece_size = len(piece.encode("utf-8"))
+                # The lines kept after a paragraph cut may still leave no room
+                while lines and size + piece_size > max_bytes:
+                    cut = last_break if last_break > len(lines) // 2 else len(lines)
+                    chunks.append("".join(lines[:cut]))
+                    lines, sizes = lines[cut:], sizes[cut:]
+                    size, last_break = sum(sizes), 0
+                lines.append(piece)
+                sizes.append(piece_size)
+                size += piece_size
+                if not piece.strip():
+                    last_break = len(lines)
+    if lines:
+        chunks.append("".join(lines))
+    return [chunk.strip() for chunk in chunks if chunk.strip()]
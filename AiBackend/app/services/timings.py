@@ -0,0 +1,34 @@
+import threading
+import time
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+def start_timings():
+    """Begin collecting stage timings for the current request thread."""
+    _local.timings = []
+
+
+@contextmanager
+def stage(name):
+    """Time a block and record it under ``name`` (if collection is active)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        timings = getattr(_local, "timings", None)
+        if timings is not None:
+            timings.append((name, elapsed_ms))
+
+
+def collect_timings():
+    """Return ``{stage: {"calls": n, "total_ms": ms}}`` and stop collecting."""
+    summary = {}
+    for name, elapsed_ms in getattr(_local, "timings", None) or []:
+        entry = summary.setdefault(name, {"calls": 0, "total_ms": 0.0})
+        entry["calls"] += 1
+        entry["total_ms"] = round(entry["total_ms"] + elapsed_ms, 1)
+    _local.timings = None
+    return summary
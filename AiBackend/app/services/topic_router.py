@@ -0,0 +1,166 @@
+import re
+
+from app.config import Config
+from app.services.embeddings import get_embeddings
+from app.services.lazy import lazy_resource
+
+FALLBACK_CATEGORY = "agriculture"
+
+# Seed queries per advisory category; their mean embedding is the centroid.
+CATEGORY_EXAMPLES = {
+    "agriculture": [
+        "best time to sow wheat in Punjab",
+        "how much water does paddy need",
+        "irrigation schedule for sugarcane",
+        "which variety of maize gives high yield",
+        "crop rotation after cotton",
+        "spacing between tomato plants",
+        "drip irrigation for vegetables",
+        "गेहूं की बुवाई का सही समय क्या है",
+        "धान में सिंचाई कब करें",
+        "सोयाबीनची पेरणी कधी करावी",
+    ],
+    "pest": [
+        "leaves turning yellow with brown spots",
+        "white insects under cotton leaves",
+        "how to control stem borer in rice",
+        "fungus on tomato leaves",
+        "aphids on mustard crop",
+        "blight disease in potato treatment",
+        "worms eating maize cobs",
+        "धान में तना छेदक कीट का नियंत्रण",
+        "टमाटर की पत्तियों पर धब्बे",
+        "कापसावर बोंड अळीचा प्रादुर्भाव",
+    ],
+    "organic": [
+        "natural pesticide for vegetables",
+        "how to make vermicompost",
+        "jeevamrut preparation method",
+        "organic farming certification",
+        "neem oil spray for insects",
+        "green manure crops for soil",
+        "bio fertilizer for pulses",
+        "जैविक खेती कैसे करें",
+        "घर पर केंचुआ खाद बनाना",
+        "सेंद्रिय शेती कशी करावी",
+    ],
+    "scheme": [
+        "PM Kisan eligibility",
+        "subsidy for drip irrigation",
+        "crop insurance scheme PMFBY",
+        "kisan credit card loan",
+        "government scheme for tractor purchase",
+        "how to apply for solar pump subsidy",
+        "soil health card registration",
+        "प्रधानमंत्री किसान सम्मान निधि योजना",
+        "किसान क्रेडिट कार्ड कैसे बनवाएं",
+        "शेतकऱ्यांसाठी सरकारी अनुदान योजना",
+    ],
+    "soil": [
+        "my soil pH is 8.5 what to do",
+        "low nitrogen in soil test report",
+        "how to improve soil fertility",
+        "soil is too acidic",
+        "potassium deficiency in soil",
+        "interpret my soil health card values",
+        "saline soil reclamation",
+        "मिट्टी की जांच रिपोर्ट कैसे पढ़ें",
+        "मिट्टी में नाइट्रोजन की कमी",
+        "जमिनीचा सामू कसा सुधारावा",
+    ],
+}
+
+KEYWORDS = [
+    ("pest", ["pest", "disease", "infection", "infestation", "worm", "fungus"]),
+    ("organic", ["organic", "natural", "bio", "eco-friendly"]),
+    ("scheme", ["scheme", "subsidy", "government", "loan", "kisan"]),
+    ("soil", ["soil", "ph", "nitrogen", "potassium", "fertility"]),
+]
+
+
+def classify_keywords(topic):
+    """The original keyword rules, matched as whole words ("ph" no longer hits "phosphate")."""
+    topic_lower = topic.lower()
+    for category, keywords in KEYWORDS:
+        if any(re.search(rf"\b{re.escape(kw)}(s|es)?\b", topic_lower) for kw in keywords):
+            return category
+    return FALLBACK_CATEGORY
+
+
+class TopicRouter:
+    """Nearest-centroid router over sentence embeddings.
+
+    One query embedding plus five dot products per call. Queries whose best
+    cosine score is under ``threshold`` fall back to ``FALLBACK_CATEGORY``.
+    """
+
+    def __init__(self, embeddings, examples, threshold, multi_margin):
+        import numpy as np
+
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.multi_margin = multi_margin
+        self.categories = list(examples)
+        centroids = []
+        for category in self.categories:
+            vectors = np.asarray(embeddings.embed_documents(examples[category]), dtype=np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            centroid = vectors.mean(axis=0)
+            centroids.append(centroid / np.linalg.norm(centroid))
+        self.centroids = np.stack(centroids)
+
+    def scores(self, query):
+        """``[(category, cosine), ...]`` best first."""
+        import numpy as np
+
+        vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        vector /= np.linalg.norm(vector) or 1.0
+        similarities = self.centroids @ vector
+        return sorted(zip(self.categories, similarities.tolist()), key=lambda item: item[1], reverse=True)
+
+    def classify(self, query):
+        """Return ``(category, confidence)``."""
+        category, score = self.scores(query)[0]
+        if score < self.threshold:
+            return FALLBACK_CATEGORY, score
+        return category, score
+
+    def classify_multi(self, query):
+        """All categories above threshold and within ``multi_margin`` of the best."""
+        ranked = self.scores(query)
+        best = ranked[0][1]
+        selected = [(c, s) for c, s in ranked if s >= self.threshold and s >= best - self.multi_margin]
+        return selected or [(FALLBACK_CATEGORY, best)]
+
+
+@lazy_resource("topic_router", enabled=lambda: Config.TOPIC_ROUTER == "embedding")
+def get_topic_router():
+    return TopicRouter(
+        get_embeddings(),
+        CATEGORY_EXAMPLES,
+        threshold=Config.TOPIC_ROUTER_THRESHOLD,
+        multi_margin=Config.TOPIC_ROUTER_MULTI_MARGIN
+    )
+
+
+def classify_topic(topic):
+    """Single advisory category for ``topic`` using the configured router.
+
+    If the embedding router cannot load or embed, the keyword rules answer.
+    """
+    if Config.TOPIC_ROUTER == "embedding":
+        try:
+            return get_topic_router().classify(topic)[0]
+        except Exception as e:
+            print(f"[ERROR] Embedding topic router failed, using keywords: {e}")
+    return classify_keywords(topic)
+
+
+def classify_topics(topic):
+    """Multi-label variant: list of categories, best first."""
+    if Config.TOPIC_ROUTER == "embedding":
+        try:
+            return [category for category, _ in get_topic_router().classify_multi(topic)]
+        except Exception as e:
+            print(f"[ERROR] Embedding topic router failed, using keywords: {e}")
+    return [classify_keywords(topic)]
@@ -0,0 +1,93 @@
+"""Upload handling that never holds a whole file in Python memory.
+
+``SpooledRequest`` makes Werkzeug write every uploaded file above
+``UPLOAD_SPOOL_THRESHOLD`` to a named temporary file while the multipart
+body is parsed, so views can hand the path to PyMuPDF/Pillow or hash and
+base64-encode it block by block. ``upload_limit`` applies a per-endpoint
+cap on top of the app-wide ``MAX_CONTENT_LENGTH``.
+"""
+import base64
+import hashlib
+import json
+import tempfile
+from functools import wraps
+from io import BytesIO
+
+from flask import Request, jsonify, request
+
+from app.config import Config
+
+BLOCK_SIZE = 3 * 256 * 1024  # a multiple of 3, so base64 blocks join without padding
+
+
+class SpooledRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if total_content_length is not None and total_content_length <= Config.UPLOAD_SPOOL_THRESHOLD:
+            return BytesIO()
+        return tempfile.NamedTemporaryFile("w+b", prefix="upload-", dir=Config.UPLOAD_TMP_DIR)
+
+
+def upload_limit(max_mb):
+    """Reject request bodies over ``max_mb`` with 413 before they are parsed."""
+    max_bytes = int(max_mb * 1024 * 1024)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.content_length is not None and request.content_length > max_bytes:
+                return jsonify({"error": f"Upload too large (limit {max_mb} MB)."}), 413
+            # Also enforced while streaming, for bodies without Content-Length
+            request.max_content_length = max_bytes
+            return view(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def file_path(storage):
+    """Filesystem path of a spooled upload, or ``None`` if it is in memory."""
+    name = getattr(storage.stream, "name", None)
+    return name if isinstance(name, str) else None
+
+
+def iter_blocks(storage, block_size=BLOCK_SIZE):
+    storage.stream.seek(0)
+    for block in iter(lambda: storage.stream.read(block_size), b""):
+        yield block
+    storage.stream.seek(0)
+
+
+def sha256_upload(storage):
+    digest = hashlib.sha256()
+    for block in iter_blocks(storage):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+def upload_size(storage):
+    stream = storage.stream
+    stream.seek(0, 2)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def json_body_with_data_url(payload, placeholder, blocks, mimetype):
+    """Serialize ``payload`` to a temporary file, replacing the string
+    ``placeholder`` with a ``data:`` URL streamed from ``blocks``.
+
+    Only one base64 block is in memory at a time. ``blocks`` must yield
+    chunks whose length is a multiple of 3 (except the last). The returned
+    temporary file is positioned at 0 and can be passed as a request body;
+    close it when done.
+    """
+    body = json.dumps(payload)
+    prefix, suffix = body.split(json.dumps(placeholder), 1)
+    out = tempfile.TemporaryFile("w+b", prefix="body-", dir=Config.UPLOAD_TMP_DIR)
+    out.write(f'{prefix}"data:{mimetype};base64,'.encode("utf-8"))
+    for block in blocks:
+        out.write(base64.b64encode(block))
+    out.write(f'"{suffix}'.encode("utf-8"))
+    out.seek(0)
+    return out
+
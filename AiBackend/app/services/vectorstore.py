@@ -0,0 +1,74 @@
+import os
+import time
+
+from app.config import Config
+from app.services.embeddings import get_embeddings
+from app.services.lazy import lazy_resource
+
+
+class VectorStoreError(RuntimeError):
+    pass
+
+
+@lazy_resource("vectorstore", enabled=lambda: Config.RETRIEVER_BACKEND != "faiss")
+def get_vectorstore():
+    """The process-wide Chroma store, validated and warmed on first use.
+
+    The path comes from ``Config.VECTOR_STORE_DIR`` (absolute, so it no
+    longer depends on the working directory). Opening fails loudly when the
+    directory or collection is missing or holds fewer than
+    ``VECTOR_STORE_MIN_DOCS`` chunks, instead of silently creating an empty
+    collection. A warm-up query then pages the HNSW index in.
+
+    The app only ever reads from this handle; ingestion goes through
+    ``create_vectorstore.py``.
+    """
+    import chromadb
+    from chromadb.config import Settings
+    from langchain_community.vectorstores import Chroma
+
+    path = Config.VECTOR_STORE_DIR
+    if not os.path.isdir(path):
+        raise VectorStoreError(f"Vector store directory not found: {path}")
+
+    client = chromadb.PersistentClient(
+        path=path,
+        settings=Settings(anonymized_telemetry=False, allow_reset=False)
+    )
+    try:
+        collection = client.get_collection(Config.VECTOR_COLLECTION)
+    except Exception as e:
+        raise VectorStoreError(
+            f"Collection '{Config.VECTOR_COLLECTION}' not found in {path}: {e}"
+        ) from e
+
+    count = collection.count()
+    if count < Config.VECTOR_STORE_MIN_DOCS:
+        raise VectorStoreError(
+            f"Collection '{Config.VECTOR_COLLECTION}' in {path} has {count} chunks "
+            f"(expected at least {Config.VECTOR_STORE_MIN_DOCS})"
+        )
+
+    store = Chroma(
+        client=client,
+        collection_name=Config.VECTOR_COLLECTION,
+        embedding_function=get_embeddings()
+    )
+
+    start = time.perf_counter()
+    store.similarity_search(Config.VECTOR_STORE_WARMUP_QUERY, k=1)
+    print(f"[VECTORSTORE] {path} '{Config.VECTOR_COLLECTION}': {count} chunks, "
+          f"warm-up query {(time.perf_counter() - start) * 1000:.1f} ms")
+    return store
+
+
+def get_search_backend():
+    """The store ``retrieve_chunks`` searches, per ``Config.RETRIEVER_BACKEND``.
+
+    Both backends answer ``similarity_search_by_vector(vector, k)`` with
+    LangChain ``Document`` objects.
+    """
+    if Config.RETRIEVER_BACKEND == "faiss":
+        from app.services.faiss_index import get_faiss_index
+        return get_faiss_index()
+    return get_vectorstore()
@@ -0,0 +1,112 @@
+import datetime
+import threading
+import time
+
+from app.config import Config
+from app.services.lazy import lazy_resource
+from app.services.llm_client import get_session
+from app.services.soil_cache import grid_cell, cell_center
+
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+HOURLY_FIELDS = {
+    "temperature": "temperature_2m",
+    "humidity": "relativehumidity_2m",
+    "precipitation": "precipitation",
+    "windspeed": "windspeed_10m"
+}
+
+
+class WeatherCache:
+    """Short-lived, in-process cache of Open-Meteo hourly forecasts per grid cell.
+
+    One fetch covers the next ``hours`` hours (UTC) for the cell centre and
+    stays valid until its last hour has passed, so everyone in the same cell
+    shares it. Concurrent misses for a cell wait on a single fetch. Expired
+    forecasts and idle per-cell locks are dropped whenever a new forecast is
+    stored, so memory tracks the cells requested within the validity window.
+    """
+
+    def __init__(self, resolution, hours):
+        self.resolution = resolution
+        self.hours = hours
+        self._forecasts = {}  # cell -> (expires_at, times, hourly)
+        self._lock = threading.Lock()
+        self._cell_locks = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def current(self, lat, lon):
+        """Weather for the current UTC hour at (lat, lon)."""
+        cell = grid_cell(lat, lon, self.resolution)
+        forecast = self._cached(cell)
+        if forecast is None:
+            with self._lock:
+                cell_lock = self._cell_locks.setdefault(cell, threading.Lock())
+            with cell_lock:
+                forecast = self._cached(cell, count=False)
+                if forecast is None:
+                    forecast = self._fetch(cell)
+                    with self._lock:
+                        self._prune()
+                        self._forecasts[cell] = forecast
+                        self.stats["misses"] += 1
+        _, times, hourly = forecast
+        index = current_hour_index(times)
+        return {name: hourly[field][index] for name, field in HOURLY_FIELDS.items()}
+
+    def _cached(self, cell, count=True):
+        with self._lock:
+            forecast = self._forecasts.get(cell)
+            if forecast and forecast[0] > time.time():
+                if count:
+                    self.stats["hits"] += 1
+                return forecast
+        return None
+
+    def _prune(self):
+        """Drop expired forecasts and unheld locks of cells without one (holds ``_lock``)."""
+        now = time.time()
+        for cell in [cell for cell, forecast in self._forecasts.items() if forecast[0] <= now]:
+            del self._forecasts[cell]
+        for cell in [cell for cell, lock in self._cell_locks.items()
+                     if cell not in self._forecasts and not lock.locked()]:
+            del self._cell_locks[cell]
+
+    def _fetch(self, cell):
+        lat, lon = cell_center(cell, self.resolution)
+        response = get_session().get(OPEN_METEO_URL, params={
+            "latitude": lat,
+            "longitude": lon,
+            "hourly": ",".join(HOURLY_FIELDS.values()),
+            "forecast_hours": self.hours,
+            "timezone": "GMT"
+        }, timeout=Config.UPSTREAM_TIMEOUT)
+        response.raise_for_status()
+        hourly = response.json()["hourly"]
+        times = hourly["time"]
+        last_hour = datetime.datetime.fromisoformat(times[-1]).replace(tzinfo=datetime.timezone.utc)
+        expires_at = last_hour.timestamp() + 3600
+        return expires_at, times, hourly
+
+    def info(self):
+        with self._lock:
+            now = time.time()
+            live = sum(1 for expires_at, _, _ in self._forecasts.values() if expires_at > now)
+            return {**self.stats, "cells": live}
+
+
+def current_hour_index(times, now=None):
+    """Index of the current UTC hour in Open-Meteo ``hourly.time`` (GMT) strings."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    current = now.strftime("%Y-%m-%dT%H:00")
+    index = 0
+    for i, stamp in enumerate(times):
+        if stamp <= current:
+            index = i
+        else:
+            break
+    return index
+
+
+@lazy_resource("weather_cache")
+def get_weather_cache():
+    return WeatherCache(Config.WEATHER_CACHE_CELL_DEG, Config.WEATHER_FORECAST_HOURS)
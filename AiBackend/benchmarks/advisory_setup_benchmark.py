@@ -0,0 +1,71 @@
+"""Per-request crewai setup cost for /advisory/ask: before vs after pooling.
+
+"before" rebuilds what the route used to build on every request — all five
+agents, five tasks and a Crew. "after" borrows a prebuilt crew from
+``crew_pool``. No LLM call is made; only object construction is timed.
+
+    python benchmarks/advisory_setup_benchmark.py --iterations 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from app.routes.agri_advisory import (  # noqa: E402
+    CATEGORY_TASKS, create_agents, crew_pool, get_llm, get_retrieve_context_tool
+)
+
+
+def setup_before(category):
+    from crewai import Task, Crew, Process
+
+    agents = create_agents()
+    tasks = {
+        name: Task(
+            description=spec["description"].format(topic="benchmark topic"),
+            expected_output=spec["expected_output"],
+            agent=agents[spec["agent"]]
+        )
+        for name, spec in CATEGORY_TASKS.items()
+    }
+    task = tasks[category]
+    return Crew(agents=[task.agent], tasks=[task], process=Process.sequential, verbose=True)
+
+
+def setup_after(category):
+    with crew_pool.borrow(category) as crew:
+        return crew
+
+
+def measure(fn, iterations):
+    samples = []
+    for i in range(iterations):
+        category = list(CATEGORY_TASKS)[i % len(CATEGORY_TASKS)]
+        start = time.perf_counter()
+        fn(category)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    # Shared, already-lazy resources are built once up front for both cases
+    get_llm()
+    get_retrieve_context_tool()
+
+    print(f"{'setup':<8} {'mean ms':>9} {'p50 ms':>9} {'max ms':>9}")
+    for name, fn in (("before", setup_before), ("after", setup_after)):
+        samples = measure(fn, args.iterations)
+        print(f"{name:<8} {statistics.mean(samples):9.3f} {statistics.median(samples):9.3f} {max(samples):9.3f}")
+    print(f"crew pool: {crew_pool.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Calibrate the /plant-disease diagnosis-cache thresholds.
+
+The cache must hit for the same leaf photographed again or re-encoded, and
+must miss for a different leaf or the same leaf with changed symptoms. For
+every image in ``--images`` (or, by default, synthetic leaves) this builds:
+
+- near-duplicates: re-encoded, resized, cropped, blurred, brighter and
+  white-balance-shifted copies, plus real re-shots of the same leaf, named
+  ``<leaf>__<anything>.jpg`` (files sharing the part before ``__``);
+- symptom changes: the same photo with its green pixels yellowed;
+- distinct pairs: every pair of images of different leaves.
+
+It then prints the pHash and colour distances and, for a grid of
+thresholds, the near-duplicate hit rate and the false-hit rates.
+
+    python benchmarks/diagnosis_cache_benchmark.py
+    python benchmarks/diagnosis_cache_benchmark.py --images ~/leaf_photos
+"""
+import argparse
+import os
+import sys
+from io import BytesIO
+from itertools import combinations
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.config import Config  # noqa: E402
+from app.services.image_preprocess import color_distance, fingerprint  # noqa: E402
+
+EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff")
+
+
+def synthetic_leaf(seed, size=(1200, 900)):
+    """Green ellipse with veins on a soil-coloured, noisy background."""
+    import random
+
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFilter
+
+    rnd = random.Random(seed)
+    width, height = size
+    image = Image.new("RGB", size, (rnd.randint(90, 150), rnd.randint(70, 110), rnd.randint(40, 80)))
+    draw = ImageDraw.Draw(image)
+    cx, cy = width // 2 + rnd.randint(-150, 150), height // 2 + rnd.randint(-100, 100)
+    a, b = rnd.randint(300, 480), rnd.randint(150, 280)
+    green = (rnd.randint(40, 80), rnd.randint(120, 160), rnd.randint(30, 60))
+    vein = tuple(min(255, c + 35) for c in green)
+    draw.ellipse([cx - a, cy - b, cx + a, cy + b], fill=green)
+    draw.line([cx - a, cy, cx + a, cy], fill=vein, width=6)
+    for _ in range(12):
+        draw.line([cx + rnd.randint(-a, a), cy, cx + rnd.randint(-a, a), cy + rnd.choice([-1, 1]) * b],
+                  fill=vein, width=3)
+    noise = np.random.default_rng(seed).integers(-12, 12, (height, width, 3))
+    pixels = np.clip(np.asarray(image, dtype=np.int16) + noise, 0, 255).astype("uint8")
+    return Image.fromarray(pixels).filter(ImageFilter.GaussianBlur(1))
+
+
+def load_images(directory):
+    from PIL import Image, ImageOps
+
+    images = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(EXTENSIONS):
+            with Image.open(os.path.join(directory, name)) as image:
+                leaf = os.path.splitext(name)[0].split("__")[0]
+                images.append((leaf, name, ImageOps.exif_transpose(image).convert("RGB")))
+    return images
+
+
+def reencode(image, quality):
+    from PIL import Image
+
+    out = BytesIO()
+    image.save(out, "JPEG", quality=quality)
+    return Image.open(BytesIO(out.getvalue())).convert("RGB")
+
+
+def near_duplicates(image):
+    from PIL import Image, ImageEnhance, ImageFilter
+
+    width, height = image.size
+    yield "jpeg q50", reencode(image, 50)
+    yield "resize 40%", image.resize((int(width * 0.4), int(height * 0.4)))
+    yield "crop 4%", image.crop((int(width * 0.02), int(height * 0.02), int(width * 0.98), int(height * 0.98)))
+    yield "blur", image.filter(ImageFilter.GaussianBlur(2))
+    yield "brightness +10%", ImageEnhance.Brightness(image).enhance(1.1)
+    yield "warmer white balance", Image.merge("RGB", [
+        channel.point(lambda value, factor=factor: min(255, int(value * factor)))
+        for channel, factor in zip(image.split(), (1.06, 1.0, 0.94))
+    ])
+
+
+def yellowed(image, strength):
+    """Shift green hues towards yellow by ``strength`` × 45°."""
+    import numpy as np
+    from PIL import Image
+
+    hsv = np.asarray(image.convert("HSV")).astype(np.int16)
+    hue, saturation = hsv[..., 0], hsv[..., 1]
+    green = (hue > 40) & (hue < 120) & (saturation > 50)  # 56°–170°
+    hsv[..., 0] = np.where(green, hue - int(32 * strength), hue)
+    return Image.fromarray(hsv.astype("uint8"), "HSV").convert("RGB")
+
+
+def distance(a, b):
+    (hash_a, color_a), (hash_b, color_b) = a, b
+    return bin(hash_a ^ hash_b).count("1"), float(color_distance(color_a, color_b))
+
+
+def hit_rate(pairs, max_bits, max_color):
+    if not pairs:
+        return None
+    return sum(bits <= max_bits and color <= max_color for bits, color in pairs) / len(pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", help="directory of leaf photos (default: synthetic)")
+    parser.add_argument("--count", type=int, default=8, help="synthetic leaves")
+    parser.add_argument("--verbose", action="store_true", help="print every pair")
+    args = parser.parse_args()
+
+    if args.images:
+        images = load_images(args.images)
+    else:
+        images = [(f"leaf{seed}", f"synthetic-{seed}", synthetic_leaf(seed)) for seed in range(1, args.count + 1)]
+    prints = [fingerprint(image) for _, _, image in images]
+
+    duplicates, symptoms, distinct = [], [], []
+    for (leaf, name, image), original in zip(images, prints):
+        for label, variant in near_duplicates(image):
+            duplicates.append(distance(original, fingerprint(variant)))
+            if args.verbose:
+                print(f"  duplicate  {name:24} {label:22} {duplicates[-1]}")
+        for strength in (0.5, 1.0):
+            symptoms.append(distance(original, fingerprint(yellowed(image, strength))))
+            if args.verbose:
+                print(f"  yellowed   {name:24} {strength:<22} {symptoms[-1]}")
+    for (i, (leaf_a, name_a, _)), (j, (leaf_b, name_b, _)) in combinations(enumerate(images), 2):
+        pair = distance(prints[i], prints[j])
+        (duplicates if leaf_a == leaf_b else distinct).append(pair)
+        if args.verbose:
+            print(f"  {'re-shot' if leaf_a == leaf_b else 'distinct':10} {name_a} / {name_b}: {pair}")
+
+    print(f"{len(images)} images: {len(duplicates)} near-duplicate, {len(symptoms)} yellowed, "
+          f"{len(distinct)} distinct pairs")
+    print(f"{'bits':>4} {'colour':>6}  {'dup hit':>8} {'yellow hit':>10} {'distinct hit':>12}")
+    defaults = (Config.DIAGNOSIS_CACHE_MAX_DISTANCE, Config.DIAGNOSIS_CACHE_MAX_COLOR_DISTANCE)
+    for max_bits in (2, 4, 6, 8):
+        for max_color in (0.03, 0.05, 0.08, 1.0):
+            rates = [hit_rate(pairs, max_bits, max_color) for pairs in (duplicates, symptoms, distinct)]
+            cells = ["-" if rate is None else f"{rate:.0%}" for rate in rates]
+            marker = "  <- default" if (max_bits, max_color) == defaults else ""
+            print(f"{max_bits:>4} {max_color:>6.2f}  {cells[0]:>8} {cells[1]:>10} {cells[2]:>12}{marker}")
+
+
+if __name__ == "__main__":
+    main()
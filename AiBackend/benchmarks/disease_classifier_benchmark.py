@@ -0,0 +1,63 @@
+"""Accuracy, local coverage and latency of the plant-disease triage classifier.
+
+Expects a PlantVillage-style folder: one sub-folder per class label holding
+that class's images. For each confidence threshold it reports the share
+of images answered locally (coverage), the accuracy of those local
+answers, and the classifier's per-image latency.
+
+    DISEASE_CLASSIFIER_MODEL=models/plantvillage_int8.onnx \\
+        python benchmarks/disease_classifier_benchmark.py --images ~/plantvillage/val --limit 50
+"""
+import argparse
+import os
+import statistics
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.services.disease_classifier import get_disease_classifier  # noqa: E402
+
+EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+def load_dataset(directory, limit):
+    samples = []
+    for label in sorted(os.listdir(directory)):
+        folder = os.path.join(directory, label)
+        if not os.path.isdir(folder):
+            continue
+        names = sorted(n for n in os.listdir(folder) if n.lower().endswith(EXTENSIONS))[:limit]
+        samples.extend((label, os.path.join(folder, name)) for name in names)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", required=True)
+    parser.add_argument("--limit", type=int, default=50, help="images per class")
+    parser.add_argument("--thresholds", default="0.5,0.7,0.8,0.85,0.9,0.95")
+    args = parser.parse_args()
+
+    classifier = get_disease_classifier()
+    samples = load_dataset(args.images, args.limit)
+    results = []
+    for label, path in samples:
+        with open(path, "rb") as f:
+            predicted, confidence, elapsed_ms = classifier.predict(f)
+        results.append((predicted == label, confidence, elapsed_ms))
+
+    latencies = sorted(ms for _, _, ms in results)
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+    print(f"{len(results)} images, top-1 accuracy {sum(ok for ok, _, _ in results) / len(results):.3f}, "
+          f"latency p50 {statistics.median(latencies):.1f} ms, p99 {p99:.1f} ms")
+    print(f"{'threshold':>9} {'coverage':>9} {'local acc':>10} {'escalated':>10}")
+    for threshold in (float(t) for t in args.thresholds.split(",")):
+        local = [ok for ok, confidence, _ in results if confidence >= threshold]
+        accuracy = sum(local) / len(local) if local else float("nan")
+        print(f"{threshold:9.2f} {len(local) / len(results):9.3f} {accuracy:10.3f} "
+              f"{len(results) - len(local):10d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""CPU and memory: per-worker MiniLM vs the shared embedding service.
+
+Starts ``--workers`` processes that each embed ``--queries`` queries from
+``--threads`` threads (queries cycle through the advisory topic set, so
+repeats exercise the cache). Run once with the model in every worker and
+once against ``embedding_server.py``; reports summed CPU seconds per query,
+summed peak RSS of all processes (server included) and per-query latency.
+
+    python benchmarks/embedding_service_benchmark.py --workers 4 --threads 8 --queries 500
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_DATA = os.path.join(ROOT, "benchmarks", "data", "advisory_topics.jsonl")
+
+
+def load_queries(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["query"] for line in f if line.strip()]
+
+
+def worker(args):
+    socket_path, queries, threads = args
+    if socket_path:
+        from app.services.embedding_service import RemoteEmbeddings
+        model = RemoteEmbeddings(socket_path)
+    else:
+        from app.services.embeddings import load_local_model
+        model = load_local_model()
+    model.embed_query("warm-up")
+
+    start_cpu = time.process_time()
+
+    def timed(query):
+        start = time.perf_counter()
+        model.embed_query(query)
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(threads) as pool:
+        latencies = list(pool.map(timed, queries))
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return time.process_time() - start_cpu, usage.ru_maxrss * 1024, latencies
+
+
+def proc_stats(pid):
+    """(CPU seconds, peak RSS bytes) of another process, from /proc."""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    with open(f"/proc/{pid}/status") as f:
+        peak = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmHWM"))
+    return cpu, peak
+
+
+def run(name, socket_path, queries, args, server_pid=None):
+    server_before = proc_stats(server_pid)[0] if server_pid else 0.0
+    jobs = [(socket_path, queries[i::args.workers], args.threads) for i in range(args.workers)]
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        results = pool.map(worker, jobs)
+    wall = time.perf_counter() - start
+
+    cpu = sum(r[0] for r in results)
+    rss = sum(r[1] for r in results)
+    if server_pid:
+        server_cpu, server_rss = proc_stats(server_pid)
+        cpu += server_cpu - server_before
+        rss += server_rss
+    latencies = sorted(ms for r in results for ms in r[2])
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+    print(f"{name:<10} {cpu * 1000 / len(queries):10.2f} {rss / 1e6:10.0f} "
+          f"{statistics.median(latencies):9.2f} {p99:9.2f} {len(queries) / wall:9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=DEFAULT_DATA)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    base = load_queries(args.data)
+    queries = [base[i % len(base)] for i in range(args.queries)]
+    print(f"{args.workers} workers x {args.threads} threads, {len(queries)} queries "
+          f"({len(base)} distinct)")
+    print(f"{'mode':<10} {'CPU ms/q':>10} {'RSS MB':>10} {'p50 ms':>9} {'p99 ms':>9} {'q/s':>9}")
+
+    run("in-process", None, queries, args)
+
+    socket_path = os.path.join(tempfile.mkdtemp(), "embed.sock")
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "embedding_server.py"), "--socket", socket_path],
+        cwd=ROOT
+    )
+    try:
+        while not os.path.exists(socket_path):
+            if server.poll() is not None:
+                sys.exit("embedding_server.py exited before opening its socket")
+            time.sleep(0.1)
+        run("service", socket_path, queries, args, server_pid=server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
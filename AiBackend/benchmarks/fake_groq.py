@@ -0,0 +1,73 @@
+"""Stand-in for the Groq chat-completions API used by the benchmarks.
+
+Answers every POST after a fixed delay so the benchmarks measure how the
+server copes with slow upstream calls, not Groq itself.
+
+    python benchmarks/fake_groq.py --port 9100 --latency 2
+    GROQ_API_URL=http://127.0.0.1:9100/openai/v1/chat/completions python serve.py
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = "This is a canned reply from the fake Groq server. " * 8
+
+
+def make_handler(latency):
+    class FakeGroqHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            time.sleep(latency)
+            if payload.get("stream"):
+                return self.stream_reply()
+            body = json.dumps({
+                "choices": [{"message": {"role": "assistant", "content": REPLY}}]
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def stream_reply(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for word in REPLY.split(" "):
+                chunk = {"choices": [{"delta": {"content": word + " "}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    return FakeGroqHandler
+
+
+def start_fake_groq(port=0, latency=1.0):
+    """Start the fake server in a daemon thread; return ``(server, url)``."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/openai/v1/chat/completions"
+    return server, url
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=1.0)
+    args = parser.parse_args()
+    server, url = start_fake_groq(args.port, args.latency)
+    print(f"Fake Groq listening on {url} (latency {args.latency}s)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,127 @@
+"""Quality and latency of vector vs BM25 vs hybrid (RRF) vs hybrid + reranker.
+
+Self-supervised: each sampled chunk yields two queries whose relevant
+answer is that chunk —
+
+    phrase   a window of ordinary words from the chunk (semantic match)
+    exact    the chunk's code-like tokens (numbers, hyphenated names,
+             variety/product codes) plus a few context words
+
+A ``--queries`` JSONL file with {"query": ..., "relevant": "<chunk text substring>"}
+can be used instead. Reports hit@k, MRR@k and p50/p99 retrieval latency
+(query embedding excluded and reported separately).
+
+    python benchmarks/hybrid_retrieval_benchmark.py --samples 200 --k 3
+    python benchmarks/hybrid_retrieval_benchmark.py --reranker cross-encoder/ms-marco-MiniLM-L-6-v2
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.config import Config  # noqa: E402
+from app.services import hybrid_search as hybrid  # noqa: E402
+from app.services.embeddings import get_embeddings  # noqa: E402
+from app.services.vectorstore import get_search_backend  # noqa: E402
+
+
+def code_like(token):
+    return any(ch.isdigit() for ch in token) or not token.isalnum()
+
+
+def sample_queries(docs, samples, seed=0):
+    rng = random.Random(seed)
+    queries = []
+    for doc in rng.sample(docs, min(samples, len(docs))):
+        words = doc.page_content.split()
+        if len(words) < 12:
+            continue
+        start = rng.randrange(len(words) - 8)
+        queries.append(("phrase", " ".join(words[start:start + 8]), doc.page_content))
+        codes = list(dict.fromkeys(w.strip(".,;()") for w in words if code_like(w.strip(".,;()"))))
+        if codes:
+            context = [w for w in words if not code_like(w) and len(w) > 4]
+            query = " ".join(codes[:2] + rng.sample(context, min(2, len(context))))
+            queries.append(("exact", query, doc.page_content))
+    return queries
+
+
+def load_queries(path, docs):
+    queries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            relevant = next((doc.page_content for doc in docs if item["relevant"] in doc.page_content), None)
+            if relevant:
+                queries.append(("file", item["query"], relevant))
+    return queries
+
+
+def evaluate(name, retrieve, queries, vectors, k):
+    by_kind = {}
+    latencies = []
+    for (kind, query, relevant), vector in zip(queries, vectors):
+        start = time.perf_counter()
+        docs = retrieve(query, vector)
+        latencies.append((time.perf_counter() - start) * 1000)
+        texts = [doc.page_content for doc in docs[:k]]
+        rank = texts.index(relevant) + 1 if relevant in texts else None
+        by_kind.setdefault(kind, []).append(rank)
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+    for kind, ranks in sorted(by_kind.items()):
+        hits = sum(1 for rank in ranks if rank) / len(ranks)
+        mrr = sum(1 / rank for rank in ranks if rank) / len(ranks)
+        print(f"{name:<16} {kind:<7} {hits:7.3f} {mrr:7.3f} "
+              f"{statistics.median(latencies):9.2f} {p99:9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries")
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--k", type=int, default=Config.ADVISORY_RETRIEVAL_K)
+    parser.add_argument("--candidates", type=int, default=Config.RETRIEVER_CANDIDATES)
+    parser.add_argument("--reranker", default=Config.RERANKER_MODEL, help="cross-encoder model (optional)")
+    args = parser.parse_args()
+
+    backend = get_search_backend()
+    start = time.perf_counter()
+    bm25 = hybrid.get_bm25_index()
+    build_ms = (time.perf_counter() - start) * 1000
+    docs = bm25.documents
+    queries = load_queries(args.queries, docs) if args.queries else sample_queries(docs, args.samples)
+
+    model = get_embeddings()
+    start = time.perf_counter()
+    vectors = [model.embed_query(query) for _, query, _ in queries]
+    embed_ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+
+    print(f"{len(docs)} chunks ({Config.RETRIEVER_BACKEND}), {len(queries)} queries, k={args.k}, "
+          f"candidates={args.candidates}; BM25 build {build_ms:.0f} ms, "
+          f"query embedding {embed_ms:.2f} ms/query")
+    print(f"{'retriever':<16} {'queries':<7} {'hit@k':>7} {'MRR':>7} {'p50 ms':>9} {'p99 ms':>9}")
+
+    evaluate("vector", lambda q, v: backend.similarity_search_by_vector(v, k=args.k), queries, vectors, args.k)
+    evaluate("bm25", lambda q, v: [doc for doc, _ in bm25.search(q, args.k)], queries, vectors, args.k)
+    evaluate("hybrid", lambda q, v: hybrid.hybrid_search(
+        q, v, backend, args.k, candidates=args.candidates, use_reranker=False
+    ), queries, vectors, args.k)
+    if args.reranker:
+        Config.RERANKER_MODEL = args.reranker
+        hybrid.get_reranker()
+        evaluate("hybrid+rerank", lambda q, v: hybrid.hybrid_search(
+            q, v, backend, args.k, candidates=args.candidates, use_reranker=True
+        ), queries, vectors, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Bytes saved and time per image for the /plant-disease preprocessing stage.
+
+Runs ``preprocess_image`` over every image in ``--images`` (or, by default,
+over synthetic 12 MP phone-style JPEGs with an EXIF orientation tag) and
+reports original vs processed size and processing time. With ``--groq``
+(needs GROQ_API_KEY) each image is also sent to the vision model raw and
+preprocessed, and the upstream latencies are compared.
+
+    python benchmarks/image_preprocess_benchmark.py
+    python benchmarks/image_preprocess_benchmark.py --images ~/leaf_photos --format webp
+    python benchmarks/image_preprocess_benchmark.py --images ~/leaf_photos --groq
+"""
+import argparse
+import base64
+import os
+import statistics
+import sys
+import time
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.config import Config  # noqa: E402
+from app.services.image_preprocess import detect_mimetype, preprocess_image  # noqa: E402
+
+EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".heic", ".bmp", ".tif", ".tiff")
+
+
+def synthetic_photos(count, size=(4000, 3000)):
+    """Leaf-green gradients with sensor-like noise, saved as q95 JPEG rotated via EXIF."""
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    photos = []
+    for i in range(count):
+        y, x = np.mgrid[0:size[1], 0:size[0]]
+        base = np.stack([40 + x * 60 // size[0], 90 + y * 100 // size[1], 30 + (x + y) * 40 // sum(size)], axis=-1)
+        noise = rng.normal(0, 12, base.shape)
+        pixels = np.clip(base + noise, 0, 255).astype("uint8")
+        image = Image.fromarray(pixels, "RGB")
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90° CW
+        out = BytesIO()
+        image.save(out, "JPEG", quality=95, exif=exif)
+        photos.append((f"synthetic-{i}.jpg", out.getvalue()))
+    return photos
+
+
+def load_images(directory):
+    images = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(EXTENSIONS):
+            with open(os.path.join(directory, name), "rb") as f:
+                images.append((name, f.read()))
+    return images
+
+
+def groq_latency(image_bytes, mimetype):
+    from app.services.llm_client import post_chat
+
+    payload = {
+        "model": "meta-llama/llama-4-scout-17b-16e-instruct",
+        "messages": [{"role": "user", "content": [
+            {"type": "text", "text": "Name the plant in one word."},
+            {"type": "image_url", "image_url": {
+                "url": f"data:{mimetype};base64,{base64.b64encode(image_bytes).decode()}"
+            }}
+        ]}],
+        "max_tokens": 5
+    }
+    start = time.perf_counter()
+    response = post_chat(payload)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images")
+    parser.add_argument("--count", type=int, default=5, help="synthetic images when --images is not given")
+    parser.add_argument("--max-side", type=int, default=Config.IMAGE_MAX_SIDE)
+    parser.add_argument("--format", default=Config.IMAGE_FORMAT, choices=("jpeg", "webp"))
+    parser.add_argument("--quality", type=int, default=Config.IMAGE_QUALITY)
+    parser.add_argument("--groq", action="store_true", help="also measure upstream latency raw vs processed")
+    args = parser.parse_args()
+
+    images = load_images(args.images) if args.images else synthetic_photos(args.count)
+    print(f"{len(images)} images -> {args.format} q{args.quality}, max side {args.max_side}px")
+    print(f"{'image':<28} {'in KB':>9} {'out KB':>8} {'ratio':>7} {'ms':>8}  {'in px':>11} {'out px':>11}")
+
+    total_in = total_out = 0
+    times = []
+    latencies = []
+    for name, data in images:
+        start = time.perf_counter()
+        try:
+            out, mimetype, info = preprocess_image(BytesIO(data), args.max_side, args.format, args.quality)
+        except OSError as e:
+            print(f"{name[:28]:<28} skipped: {e}")
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        times.append(elapsed)
+        total_in += len(data)
+        total_out += len(out)
+        print(f"{name[:28]:<28} {len(data) / 1024:9.0f} {len(out) / 1024:8.0f} {len(data) / len(out):6.1f}x "
+              f"{elapsed:8.1f}  {'x'.join(map(str, info['source_size'])):>11} {'x'.join(map(str, info['size'])):>11}")
+        if args.groq:
+            raw_type = detect_mimetype(BytesIO(data)) or "image/jpeg"
+            latencies.append((groq_latency(data, raw_type), groq_latency(out, mimetype)))
+
+    if times:
+        print(f"total {total_in / 1e6:.1f} MB -> {total_out / 1e6:.2f} MB ({total_in / total_out:.1f}x smaller), "
+              f"median {statistics.median(times):.1f} ms/image, max {max(times):.1f} ms")
+    if latencies:
+        print(f"Groq latency: raw median {statistics.median(r for r, _ in latencies):.2f} s, "
+              f"preprocessed median {statistics.median(p for _, p in latencies):.2f} s")
+
+
+if __name__ == "__main__":
+    main()
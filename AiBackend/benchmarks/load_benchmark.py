@@ -0,0 +1,113 @@
+"""Concurrent throughput: threaded ``run.py`` server vs gevent ``serve.py``.
+
+Starts a fake Groq upstream with a fixed latency, boots the app once per
+serving mode against it, fires ``--requests`` POSTs at ``/postharvest`` with
+``--concurrency`` clients and prints throughput and latency percentiles.
+
+    python benchmarks/load_benchmark.py --concurrency 200 --requests 1000 --latency 2
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_groq import start_fake_groq
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# run.py without the debug reloader, so the benchmark owns a single process.
+MODES = {
+    "sync": [sys.executable, "-c",
+             "import os; from run import app; "
+             "app.run(port=int(os.environ['SERVER_PORT']), threaded=True)"],
+    "gevent": [sys.executable, "serve.py"],
+}
+
+BODY = json.dumps({"crop": "wheat", "harvest_date": "2025-04-01", "region": "Punjab"}).encode()
+
+
+def wait_until_up(base_url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(base_url + "/", timeout=1)
+        except urllib.error.HTTPError:
+            return  # 404 on "/" means the server is answering
+        except OSError:
+            time.sleep(0.2)
+            continue
+        return
+    raise RuntimeError(f"server at {base_url} did not start")
+
+
+def one_request(url):
+    start = time.perf_counter()
+    request = urllib.request.Request(url, data=BODY, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=300) as response:
+            response.read()
+            ok = response.status == 200
+    except OSError:
+        ok = False
+    return ok, time.perf_counter() - start
+
+
+def run_load(url, concurrency, total):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: one_request(url), range(total)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for ok, latency in results if ok)
+    errors = sum(1 for ok, _ in results if not ok)
+    return elapsed, latencies, errors
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", default="sync,gevent")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=2.0, help="fake upstream latency (s)")
+    parser.add_argument("--port", type=int, default=5055)
+    args = parser.parse_args()
+
+    fake, groq_url = start_fake_groq(latency=args.latency)
+    env = dict(os.environ,
+               GROQ_API_URL=groq_url,
+               GROQ_API_KEY="benchmark",
+               SERVER_PORT=str(args.port),
+               HTTP_POOL_SIZE=str(args.concurrency),
+               STARTUP_REPORT="false")
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    print(f"upstream latency {args.latency}s, {args.requests} requests, "
+          f"concurrency {args.concurrency}")
+    print(f"{'mode':<8} {'req/s':>8} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'errors':>7}")
+    for mode in args.modes.split(","):
+        proc = subprocess.Popen(MODES[mode], cwd=ROOT, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_up(base_url)
+            elapsed, latencies, errors = run_load(base_url + "/postharvest", args.concurrency, args.requests)
+        finally:
+            proc.terminate()
+            proc.wait()
+        throughput = len(latencies) / elapsed
+        print(f"{mode:<8} {throughput:8.1f} {statistics.median(latencies) if latencies else float('nan'):8.2f} "
+              f"{percentile(latencies, 95):8.2f} {percentile(latencies, 99):8.2f} {errors:7d}")
+    fake.shutdown()
+
+
+if __name__ == "__main__":
+    main()
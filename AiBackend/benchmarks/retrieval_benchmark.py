@@ -0,0 +1,118 @@
+"""Recall@k and search latency: Chroma vs FAISS (flat / int8 / PQ).
+
+Exports the stored embeddings from the Chroma collection, builds each FAISS
+variant in a temporary directory, and compares every backend's top-k
+against exact brute-force cosine search over the same vectors.
+
+Queries come from ``--queries`` (JSONL with a "query" field) or, by
+default, from the opening words of randomly sampled chunks.
+
+    python benchmarks/retrieval_benchmark.py --samples 200 --k 3
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from app.config import Config  # noqa: E402
+from app.services.embeddings import get_embeddings  # noqa: E402
+from app.services.faiss_index import FaissIndex, write_index  # noqa: E402
+from build_faiss_index import export_collection  # noqa: E402
+
+
+def sample_queries(texts, samples, seed=0):
+    rng = random.Random(seed)
+    picked = rng.sample(range(len(texts)), min(samples, len(texts)))
+    return [" ".join(texts[i].split()[:12]) for i in picked]
+
+
+def load_queries(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["query"] for line in f if line.strip()]
+
+
+def directory_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def timed_search(search, vectors, k):
+    results, latencies = [], []
+    for vector in vectors:
+        start = time.perf_counter()
+        results.append(search(vector, k))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, sorted(latencies)
+
+
+def recall(results, truth):
+    return statistics.mean(len(set(r) & set(t)) / len(t) for r, t in zip(results, truth))
+
+
+def report(name, results, truth, latencies, size_bytes):
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+    print(f"{name:<12} {recall(results, truth):9.3f} {statistics.median(latencies):9.3f} "
+          f"{p99:9.3f} {size_bytes / 1e6:9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries")
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    import chromadb
+    from chromadb.config import Settings
+
+    ids, texts, metadatas, embeddings = export_collection()
+    normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    queries = load_queries(args.queries) if args.queries else sample_queries(texts, args.samples)
+
+    model = get_embeddings()
+    start = time.perf_counter()
+    vectors = np.asarray([model.embed_query(q) for q in queries], dtype=np.float32)
+    embed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    truth = [[ids[i] for i in np.argsort(-(normalized @ v))[:args.k]] for v in vectors]
+    print(f"{len(ids)} chunks, {len(queries)} queries, k={args.k}, query embedding {embed_ms:.2f} ms/query")
+    print(f"{'backend':<12} {'recall@k':>9} {'p50 ms':>9} {'p99 ms':>9} {'size MB':>9}")
+
+    collection = chromadb.PersistentClient(
+        path=Config.VECTOR_STORE_DIR, settings=Settings(anonymized_telemetry=False)
+    ).get_collection(Config.VECTOR_COLLECTION)
+
+    def chroma_search(vector, k):
+        return collection.query(query_embeddings=[vector.tolist()], n_results=k)["ids"][0]
+
+    results, latencies = timed_search(chroma_search, vectors, args.k)
+    report("chroma", results, truth, latencies, directory_size(Config.VECTOR_STORE_DIR))
+
+    for quantize in ("none", "int8", "pq"):
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                write_index(directory, ids, texts, metadatas, embeddings.copy(), quantize=quantize)
+            except ValueError as e:
+                print(f"faiss-{quantize:<6} skipped: {e}")
+                continue
+            index = FaissIndex(directory)
+            results, latencies = timed_search(
+                lambda vector, k: [doc["id"] for doc, _ in index.search(vector, k)], vectors, args.k
+            )
+            report(f"faiss-{quantize}", results, truth, latencies,
+                   directory_size(os.path.join(directory, "index.faiss")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Offline accuracy and latency of the advisory topic routers.
+
+Scores the keyword rules and the embedding router on a labelled query set
+(JSONL with "query" and "label") and reports accuracy plus per-query
+latency. The embedding model is loaded before timing starts.
+
+    python benchmarks/topic_router_benchmark.py
+    python benchmarks/topic_router_benchmark.py --data my_queries.jsonl
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.services.topic_router import classify_keywords, get_topic_router  # noqa: E402
+
+DEFAULT_DATA = os.path.join(ROOT, "benchmarks", "data", "advisory_topics.jsonl")
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(name, classify, rows):
+    correct = 0
+    latencies = []
+    per_label = {}
+    for row in rows:
+        start = time.perf_counter()
+        predicted = classify(row["query"])
+        latencies.append((time.perf_counter() - start) * 1000)
+        hit = predicted == row["label"]
+        correct += hit
+        label_stats = per_label.setdefault(row["label"], [0, 0])
+        label_stats[0] += hit
+        label_stats[1] += 1
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+    print(f"{name:<10} accuracy {correct / len(rows):6.1%}   "
+          f"p50 {statistics.median(latencies):7.2f} ms   p99 {p99:7.2f} ms")
+    print("           " + "  ".join(f"{label} {hits}/{total}" for label, (hits, total) in sorted(per_label.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=DEFAULT_DATA)
+    args = parser.parse_args()
+
+    rows = load(args.data)
+    start = time.perf_counter()
+    router = get_topic_router()
+    print(f"{len(rows)} labelled queries; router built in {time.perf_counter() - start:.2f} s")
+
+    evaluate("keyword", classify_keywords, rows)
+    evaluate("embedding", lambda query: router.classify(query)[0], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Peak server RSS under concurrent /plant-disease uploads.
+
+Boots the app (threaded ``run.py`` or gevent ``serve.py``) against the fake
+Groq upstream, fires ``--concurrency`` simultaneous uploads of a
+``--size-mb`` image, samples the server's RSS every few milliseconds and
+reports the idle RSS, the peak and the peak growth per in-flight upload.
+Holding a 12 MB photo as bytes + base64 + data-URL string + JSON body costs
+roughly 40–50 MB per request; spooled uploads with a streamed base64 body
+should stay at a small fraction of that.
+
+The upload is a real (noisy) JPEG of about ``--size-mb``, since
+/plant-disease rejects files it cannot decode. Preprocessing and the
+diagnosis cache are turned off so every upload takes the spool + streamed
+base64 path; pass ``--preprocess`` to measure the preprocessing path instead.
+
+    python benchmarks/upload_memory_benchmark.py --concurrency 20 --size-mb 12
+"""
+import argparse
+import os
+import subprocess
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from fake_groq import start_fake_groq
+from load_benchmark import MODES, ROOT, wait_until_up
+
+
+def rss_bytes(pid):
+    with open(f"/proc/{pid}/status") as f:
+        return next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmRSS"))
+
+
+def noisy_jpeg(size_mb, quality=95):
+    """A decodable JPEG of roughly ``size_mb``; noise keeps it from compressing."""
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+
+    def encode(width, height):
+        pixels = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        out = BytesIO()
+        Image.fromarray(pixels, "RGB").save(out, "JPEG", quality=quality)
+        return out.getvalue()
+
+    # Calibrate bytes per pixel on a small image, then scale a 4:3 frame to fit
+    bytes_per_pixel = len(encode(400, 300)) / (400 * 300)
+    height = max(int((size_mb * 1024 * 1024 / bytes_per_pixel / (4 / 3)) ** 0.5), 1)
+    return encode(height * 4 // 3, height)
+
+
+def multipart_body(field, filename, content, mimetype):
+    boundary = uuid.uuid4().hex
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f"Content-Type: {mimetype}\r\n\r\n"
+    ).encode()
+    return head + content + f"\r\n--{boundary}--\r\n".encode(), f"multipart/form-data; boundary={boundary}"
+
+
+def upload(url, body, content_type):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type})
+    try:
+        with urllib.request.urlopen(request, timeout=300) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=MODES, default="gevent")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--size-mb", type=float, default=12)
+    parser.add_argument("--latency", type=float, default=2.0, help="fake upstream latency (s)")
+    parser.add_argument("--port", type=int, default=5056)
+    parser.add_argument("--preprocess", action="store_true", help="keep IMAGE_PREPROCESS on")
+    args = parser.parse_args()
+
+    fake, groq_url = start_fake_groq(latency=args.latency)
+    env = dict(os.environ,
+               GROQ_API_URL=groq_url,
+               GROQ_API_KEY="benchmark",
+               SERVER_PORT=str(args.port),
+               STARTUP_REPORT="false",
+               IMAGE_PREPROCESS="true" if args.preprocess else "false",
+               DIAGNOSIS_CACHE="false")
+    base_url = f"http://127.0.0.1:{args.port}"
+    image = noisy_jpeg(args.size_mb)
+    body, content_type = multipart_body("image", "leaf.jpg", image, "image/jpeg")
+
+    proc = subprocess.Popen(MODES[args.mode], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(base_url)
+        idle = rss_bytes(proc.pid)
+        peak = idle
+        done = threading.Event()
+
+        def sample():
+            nonlocal peak
+            while not done.is_set():
+                peak = max(peak, rss_bytes(proc.pid))
+                time.sleep(0.005)
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            statuses = list(pool.map(
+                lambda _: upload(base_url + "/plant-disease", body, content_type), range(args.concurrency)
+            ))
+        elapsed = time.perf_counter() - start
+        done.set()
+        sampler.join()
+    finally:
+        proc.terminate()
+        proc.wait()
+        fake.shutdown()
+
+    ok = sum(1 for status in statuses if status == 200)
+    print(f"{args.mode}: {args.concurrency} x {len(image) / 1024 / 1024:.1f} MB uploads, {ok} ok, {elapsed:.1f} s")
+    print(f"idle RSS {idle / 1e6:.0f} MB, peak RSS {peak / 1e6:.0f} MB, "
+          f"growth {(peak - idle) / 1e6:.0f} MB ({(peak - idle) / 1e6 / args.concurrency:.1f} MB per upload)")
+
+
+if __name__ == "__main__":
+    main()
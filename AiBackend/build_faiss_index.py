@@ -0,0 +1,48 @@
+"""Build the FAISS retriever index from the Chroma collection.
+
+Reuses the embeddings already stored in Chroma (no re-embedding), writes
+index.faiss + docs.jsonl + offsets.npy to FAISS_INDEX_DIR. Re-run after
+create_vectorstore.py; serve it with RETRIEVER_BACKEND=faiss.
+
+    python build_faiss_index.py                  # exact (flat) index
+    python build_faiss_index.py --quantize int8  # 4x smaller, scalar-quantized
+    python build_faiss_index.py --quantize pq    # ~32x smaller, product-quantized
+"""
+import argparse
+import time
+
+from app.config import Config
+from app.services.faiss_index import QUANTIZATIONS, write_index
+
+
+def export_collection():
+    """Return ``(ids, texts, metadatas, embeddings)`` from the Chroma collection."""
+    import chromadb
+    import numpy as np
+    from chromadb.config import Settings
+
+    client = chromadb.PersistentClient(
+        path=Config.VECTOR_STORE_DIR,
+        settings=Settings(anonymized_telemetry=False)
+    )
+    data = client.get_collection(Config.VECTOR_COLLECTION).get(
+        include=["embeddings", "documents", "metadatas"]
+    )
+    return data["ids"], data["documents"], data["metadatas"], np.asarray(data["embeddings"], dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quantize", choices=QUANTIZATIONS, default="none")
+    parser.add_argument("--output", default=Config.FAISS_INDEX_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ids, texts, metadatas, embeddings = export_collection()
+    write_index(args.output, ids, texts, metadatas, embeddings, quantize=args.quantize)
+    print(f"Wrote {len(ids)} vectors ({args.quantize}) to '{args.output}' "
+          f"in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,166 @@
+"""Incrementally (re)index the PDFs in app/data/ into the Chroma store.
+
+Files and chunks are content-hashed and tracked in a manifest next to the
+store, so a run only parses changed PDFs (in a process pool), only embeds
+chunks that are new, and deletes chunks whose file changed or disappeared.
+
+    python create_vectorstore.py                 # incremental
+    python create_vectorstore.py --full          # drop and rebuild everything
+    python create_vectorstore.py --workers 8 --batch-size 512
+"""
+import argparse
+import hashlib
+import json
 import os
-from langchain_community.document_loaders import PyPDFLoader
-from langchain.embeddings import HuggingFaceEmbeddings
-from langchain.vectorstores import FAISS
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_mistralai import ChatMistralAI
-from langchain_community.vectorstores import Chroma
-
-# Path to your folder containing only PDFs
-pdf_folder_path = "./app/data/"
-
-# Initialize LLM
-llm = ChatMistralAI(
-    model="mistral-large-latest",
-    temperature=0,
-)
-
-# Function to load documents only from PDF files
-def load_pdfs_from_folder(pdf_path):
-    documents = []
-    for filename in os.listdir(pdf_path):
-        if filename.endswith(".pdf"):
-            file_path = os.path.join(pdf_path, filename)
-            loader = PyPDFLoader(file_path)
-            documents.extend(loader.load())
-    return documents
-
-# Load documents from the PDF folder
-documents = load_pdfs_from_folder(pdf_folder_path)
-
-print(f"Total PDF documents loaded: {len(documents)}")
-
-# Split documents into chunks with overlap
-text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=1000,
-    chunk_overlap=150,
-)
-split_documents = text_splitter.split_documents(documents)
-
-# Initialize embedding function
-embedding_function = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-
-# Set Chroma vector store config
-collection_name = "my_collection"
-persist_directory = "./app/chroma_db"
-
-# Create and persist the vector store
-vectorstore = Chroma.from_documents(
-    documents=split_documents,
-    embedding=embedding_function,
-    collection_name=collection_name,
-    persist_directory=persist_directory
-)
-
-vectorstore.persist()
-
-# Optional: Set up the retriever
-retriever = vectorstore.as_retriever()
-
-print(f"Vector store created and persisted to '{persist_directory}'")
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.config import Config
+
+MANIFEST_NAME = "ingest_manifest.json"
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_id(source, text):
+    return hashlib.sha256(f"{source}\0{text}".encode("utf-8")).hexdigest()
+
+
+def load_and_split(path, source, chunk_size, chunk_overlap):
+    """Parse and split one PDF (runs in a worker process)."""
+    from langchain_community.document_loaders import PyPDFLoader
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    chunks = []
+    for doc in splitter.split_documents(PyPDFLoader(path).load()):
+        metadata = {**doc.metadata, "source": source}
+        chunks.append((chunk_id(source, doc.page_content), doc.page_content, metadata))
+    return source, chunks
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(path, manifest):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def scan_pdfs(pdf_folder):
+    return {
+        filename: os.path.join(pdf_folder, filename)
+        for filename in sorted(os.listdir(pdf_folder))
+        if filename.lower().endswith(".pdf")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default=Config.PDF_DATA_DIR)
+    parser.add_argument("--full", action="store_true", help="drop the collection and re-embed everything")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="PDF parsing processes")
+    parser.add_argument("--batch-size", type=int, default=256, help="chunks embedded per batch")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=150)
+    args = parser.parse_args()
+
+    import chromadb
+    from chromadb.config import Settings
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    from langchain_community.vectorstores import Chroma
+
+    start = time.perf_counter()
+    persist_directory = Config.VECTOR_STORE_DIR
+    manifest_path = os.path.join(persist_directory, MANIFEST_NAME)
+    os.makedirs(persist_directory, exist_ok=True)
+
+    settings = {"embed_model": Config.EMBED_MODEL, "chunk_size": args.chunk_size, "chunk_overlap": args.chunk_overlap}
+    manifest = load_manifest(manifest_path)
+    client = chromadb.PersistentClient(path=persist_directory, settings=Settings(anonymized_telemetry=False))
+
+    # Without a matching manifest the stored chunk ids can't be trusted
+    if args.full or manifest is None or manifest.get("settings") != settings:
+        reason = "--full" if args.full else ("no manifest" if manifest is None else "splitter/model settings changed")
+        print(f"Full rebuild ({reason})")
+        try:
+            client.delete_collection(Config.VECTOR_COLLECTION)
+        except Exception:
+            pass
+        manifest = {"settings": settings, "files": {}}
+
+    vectorstore = Chroma(
+        client=client,
+        collection_name=Config.VECTOR_COLLECTION,
+        embedding_function=HuggingFaceEmbeddings(model_name=Config.EMBED_MODEL)
+    )
+
+    pdfs = scan_pdfs(args.data_dir)
+    known = manifest["files"]
+    hashes = {source: file_sha256(path) for source, path in pdfs.items()}
+    changed = [source for source in pdfs if known.get(source, {}).get("sha256") != hashes[source]]
+    removed = [source for source in known if source not in pdfs]
+
+    # Chunks from removed files go away entirely
+    stale_ids = []
+    for source in removed:
+        stale_ids.extend(known.pop(source)["chunk_ids"])
+
+    # Changed files: keep chunks whose content is unchanged, embed only new ones
+    new_chunks = []
+    if changed:
+        with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(changed)))) as pool:
+            futures = [
+                pool.submit(load_and_split, pdfs[source], source, args.chunk_size, args.chunk_overlap)
+                for source in changed
+            ]
+            for future in futures:
+                source, chunks = future.result()
+                old_ids = set(known.get(source, {}).get("chunk_ids", []))
+                chunk_ids = list(dict.fromkeys(cid for cid, _, _ in chunks))
+                stale_ids.extend(old_ids.difference(chunk_ids))
+                seen = set()
+                for cid, text, metadata in chunks:
+                    if cid not in old_ids and cid not in seen:
+                        new_chunks.append((cid, text, metadata))
+                        seen.add(cid)
+                known[source] = {"sha256": hashes[source], "chunk_ids": chunk_ids}
+
+    if stale_ids:
+        vectorstore.delete(ids=stale_ids)
+
+    for offset in range(0, len(new_chunks), args.batch_size):
+        batch = new_chunks[offset:offset + args.batch_size]
+        vectorstore.add_texts(
+            texts=[text for _, text, _ in batch],
+            metadatas=[metadata for _, _, metadata in batch],
+            ids=[cid for cid, _, _ in batch]
+        )
+        print(f"Embedded {min(offset + args.batch_size, len(new_chunks))}/{len(new_chunks)} chunks")
+
+    save_manifest(manifest_path, manifest)
+
+    print(
+        f"{len(pdfs)} PDFs: {len(changed)} new/changed, {len(removed)} removed, "
+        f"{len(pdfs) - len(changed)} unchanged; {len(new_chunks)} chunks embedded, "
+        f"{len(stale_ids)} deleted; collection now holds "
+        f"{client.get_collection(Config.VECTOR_COLLECTION).count()} chunks "
+        f"({time.perf_counter() - start:.1f} s)"
+    )
+    print(f"Vector store persisted to '{persist_directory}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Shared query-embedding service for the app workers.
+
+Loads EMBED_MODEL once and serves it on a Unix socket; point the workers
+at it with EMBED_SERVICE_SOCKET. Concurrent queries are micro-batched
+(EMBED_BATCH_WINDOW_MS, EMBED_BATCH_MAX) behind an LRU cache
+(EMBED_CACHE_SIZE).
+
+    python embedding_server.py --socket /tmp/agri-embed.sock
+    EMBED_SERVICE_SOCKET=/tmp/agri-embed.sock gunicorn -k gevent -w 4 serve:app
+"""
+import argparse
+import os
+import time
+
+from app.config import Config
+from app.services.embedding_service import EmbeddingServer, MicroBatcher
+from app.services.embeddings import load_local_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", default=Config.EMBED_SERVICE_SOCKET or "/tmp/agri-embed.sock")
+    parser.add_argument("--window-ms", type=float, default=Config.EMBED_BATCH_WINDOW_MS)
+    parser.add_argument("--max-batch", type=int, default=Config.EMBED_BATCH_MAX)
+    parser.add_argument("--cache-size", type=int, default=Config.EMBED_CACHE_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    model = load_local_model()
+    model.embed_documents([Config.VECTOR_STORE_WARMUP_QUERY])
+    print(f"[EMBED] {Config.EMBED_MODEL} loaded in {time.perf_counter() - start:.1f} s")
+
+    if os.path.exists(args.socket):
+        os.unlink(args.socket)
+    batcher = MicroBatcher(model, args.window_ms, args.max_batch, args.cache_size)
+    with EmbeddingServer(args.socket, batcher) as server:
+        print(f"[EMBED] Serving on {args.socket} (window {args.window_ms} ms, "
+              f"max batch {args.max_batch}, cache {args.cache_size})")
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Cooperative (gevent) server for the LLM-bound blueprints.
+
+``run.py`` gives every request its own blocking thread for the whole
+upstream round-trip. Here the standard library is monkey-patched so every
+socket wait in ``requests`` (and therefore ``app.services.llm_client``)
+yields to other greenlets, and one process can hold hundreds of in-flight
+Groq / Open-Meteo / OpenEPI calls. The views themselves are unchanged.
+
+    WARMUP_ON_START=true python serve.py
+    # or, with several processes (each worker warms itself up; no --preload):
+    WARMUP_ON_START=true gunicorn -k gevent --worker-connections 1000 -w 2 serve:app
+
+Raise HTTP_POOL_SIZE to roughly the expected upstream concurrency so
+keep-alive connections are actually reused. CPU-bound work (embeddings,
+PDF parsing) still blocks the loop while it runs.
+"""
+from gevent import monkey
+
+monkey.patch_all()
+
+from gevent.pool import Pool  # noqa: E402
+from gevent.pywsgi import WSGIServer  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.config import Config  # noqa: E402
+
+app = create_app()
+
+if __name__ == "__main__":
+    server = WSGIServer(
+        (Config.SERVER_HOST, Config.SERVER_PORT),
+        app,
+        spawn=Pool(Config.ASYNC_MAX_CONNECTIONS)
+    )
+    print(f"[SERVE] gevent server on {Config.SERVER_HOST}:{Config.SERVER_PORT} "
+          f"(max {Config.ASYNC_MAX_CONNECTIONS} connections)")
+    server.serve_forever()